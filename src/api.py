@@ -220,7 +220,7 @@ async def get_transactions(limit: int = 100):
     from .core.wallet import get_wallet
     wallet = await get_wallet()
     return {
-        "transactions": [tx.to_dict() for tx in wallet.get_transaction_history(limit)]
+        "transactions": [tx.to_dict() for tx in await wallet.fetch_transaction_history(limit)]
     }
 
 
@@ -81,6 +81,7 @@ EVENT_PRIORITY_MAP = {
     "legal_decision_required": Priority.URGENT,
     "agent_hire_approval": Priority.URGENT,
     "error_rate_high": Priority.URGENT,
+    "health_alerts": Priority.URGENT,
     
     # Standard - response within hours
     "opportunity_found": Priority.STANDARD,
@@ -23,6 +23,7 @@ class OpenRouterConfig(BaseModel):
     council_models: List[Dict[str, Any]] = Field(default_factory=list)
     fallback_models: List[str] = Field(default_factory=list)
     requests_per_minute: int = Field(default=60)
+    max_concurrent_opinions: int = Field(default=4)
     max_retries: int = Field(default=3)
     retry_delay_seconds: int = Field(default=5)
     
@@ -54,6 +55,8 @@ class WalletLimitsConfig(BaseModel):
     max_single_tx_usd: float = Field(default=1000)
     max_daily_spend_usd: float = Field(default=5000)
     max_weekly_spend_usd: float = Field(default=20000)
+    max_tx_per_second: int = Field(default=5)
+    max_tx_per_minute: int = Field(default=30)
 
 
 class WalletConfig(BaseModel):
@@ -67,6 +70,8 @@ class WalletConfig(BaseModel):
     max_gas_price_gwei: int = Field(default=50)
     gas_limit_multiplier: float = Field(default=1.2)
     approved_addresses: List[str] = Field(default_factory=list)
+    transactions_db_path: str = Field(default="data/wallet_transactions.db")
+    transactions_in_memory: int = Field(default=1000)
 
 
 class TelegramConfig(BaseModel):
@@ -194,6 +199,7 @@ class X402Config(BaseModel):
     facilitator_url: str = Field(default="https://x402.org/facilitator")
     max_agent_hire_usd: float = Field(default=500)
     max_daily_hires: int = Field(default=10)
+    max_concurrent_hires: int = Field(default=16)
     trusted_services: List[str] = Field(default_factory=list)
 
 
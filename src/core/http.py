@@ -0,0 +1,64 @@
+"""
+QualiaIA Shared HTTP Clients
+
+Process-wide connection pools shared by the council (OpenRouter) and
+the wallet (RPC), so bursts reuse warm keep-alive connections instead
+of paying a TCP + TLS handshake per client.
+"""
+
+from typing import Optional
+import logging
+
+import aiohttp
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+_aiohttp_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get shared httpx client (used by the OpenAI/OpenRouter SDK)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            # Council calls are bounded by their own timeout
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+    return _http_client
+
+
+async def get_aiohttp_session() -> aiohttp.ClientSession:
+    """Get shared aiohttp session (used by web3 RPC providers)"""
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=MAX_CONNECTIONS,
+                limit_per_host=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return _aiohttp_session
+
+
+async def close_http_clients() -> None:
+    """Close shared clients (call on shutdown)"""
+    global _http_client, _aiohttp_session
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _aiohttp_session is not None:
+        await _aiohttp_session.close()
+        _aiohttp_session = None
+    logger.info("Shared HTTP clients closed")
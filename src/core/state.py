@@ -6,16 +6,28 @@ Thread-safe, observable, and persistent.
 """
 
 import asyncio
+import heapq
+import inspect
+import weakref
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
-import json
+import time
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
+def _observer_key(callback: Callable) -> Tuple[int, int]:
+    """Stable key for a callback (bound methods are re-created on each access)"""
+    if inspect.ismethod(callback):
+        return (id(callback.__self__), id(callback.__func__))
+    return (id(callback), 0)
+
+
 class SystemStatus(str, Enum):
     """System operational status"""
     INITIALIZING = "initializing"
@@ -58,7 +70,7 @@ class DailyMetrics:
         self.errors_count = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingDecision:
     """A decision awaiting approval"""
     id: str
@@ -73,6 +85,16 @@ class PendingDecision:
     timeout_hours: int = 24
     responded_at: Optional[datetime] = None
     responded_by: Optional[str] = None
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # created_at never changes after construction
+        self._created_at_iso = self.created_at.isoformat()
+    
+    @property
+    def deadline_ts(self) -> float:
+        """Expiry deadline as a POSIX timestamp"""
+        return self.created_at.timestamp() + self.timeout_hours * 3600
     
     @property
     def is_expired(self) -> bool:
@@ -88,7 +110,7 @@ class PendingDecision:
             "council_recommendation": self.council_recommendation,
             "council_confidence": self.council_confidence,
             "status": self.status,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_at_iso,
             "timeout_hours": self.timeout_hours,
             "is_expired": self.is_expired,
         }
@@ -104,7 +126,16 @@ class SystemState:
     
     def __init__(self):
         self._lock = asyncio.Lock()
-        self._observers: Dict[str, List[Callable]] = {}
+        # event -> {callback key: callback or WeakMethod}
+        self._observers: Dict[str, Dict[Tuple[int, int], Any]] = {}
+        
+        # Observer notifications are queued and delivered by a single
+        # dispatcher task so state mutations never wait on observer I/O
+        self._max_queued_notifications = 10_000
+        self._notify_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self._max_queued_notifications
+        )
+        self._dispatcher: Optional[asyncio.Task] = None
         
         # Core state
         self.status = SystemStatus.INITIALIZING
@@ -118,10 +149,15 @@ class SystemState:
         
         # Daily metrics
         self.today = DailyMetrics()
+        self._today_ordinal = datetime.now().toordinal()
         
         # Pending decisions
         self.pending_decisions: Dict[str, PendingDecision] = {}
         
+        # Expiry min-heap of (deadline_ts, decision_id); stale entries
+        # (already resolved decisions) are dropped lazily on pop
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
         # Configuration cache
         self.config: Dict[str, Any] = {}
         
@@ -155,10 +191,19 @@ class SystemState:
             for key in changed_keys:
                 await self._notify(key, kwargs[key])
     
+    async def set_status(self, status: SystemStatus) -> None:
+        """Set system status without taking the state lock"""
+        # A single attribute write plus a non-blocking enqueue cannot
+        # interleave with another coroutine, so the lock is not needed
+        if self.status != status:
+            self.status = status
+            await self._notify("status", status)
+    
     async def add_pending_decision(self, decision: PendingDecision) -> None:
         """Add a pending decision"""
         async with self._lock:
             self.pending_decisions[decision.id] = decision
+            heapq.heappush(self._expiry_heap, (decision.deadline_ts, decision.id))
             await self._notify("pending_decision_added", decision)
     
     async def resolve_decision(
@@ -180,6 +225,29 @@ class SystemState:
             await self._notify("decision_resolved", decision)
             return decision
     
+    async def sweep_expired(self) -> List[PendingDecision]:
+        """
+        Mark pending decisions past their deadline as timed out.
+        
+        Only pops heap entries whose deadline has passed, so the cost is
+        proportional to the number of expirations, not pending decisions.
+        """
+        expired = []
+        async with self._lock:
+            now = time.time()
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, decision_id = heapq.heappop(self._expiry_heap)
+                decision = self.pending_decisions.get(decision_id)
+                if decision is None or decision.status != "pending":
+                    continue
+                
+                decision.status = "timeout"
+                decision.responded_at = datetime.now()
+                expired.append(decision)
+                await self._notify("decision_timeout", decision)
+        
+        return expired
+    
     def get_pending_decisions(self, status: str = "pending") -> List[PendingDecision]:
         """Get decisions by status"""
         return [
@@ -226,39 +294,91 @@ class SystemState:
     
     async def check_daily_reset(self) -> bool:
         """Check and reset daily metrics if needed"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        if self.today.date != today:
-            async with self._lock:
-                old_metrics = self.today
-                self.today = DailyMetrics()
-                await self._notify("daily_reset", old_metrics)
-                return True
-        return False
+        ordinal = datetime.now().toordinal()
+        if ordinal == self._today_ordinal:
+            return False
+        
+        async with self._lock:
+            # Another caller may have reset while we waited for the lock
+            if ordinal == self._today_ordinal:
+                return False
+            self._today_ordinal = ordinal
+            old_metrics = self.today
+            self.today = DailyMetrics()
+            await self._notify("daily_reset", old_metrics)
+            return True
     
     def subscribe(self, event: str, callback: Callable) -> None:
         """Subscribe to state changes"""
-        if event not in self._observers:
-            self._observers[event] = []
-        self._observers[event].append(callback)
+        key = _observer_key(callback)
+        observers = self._observers.setdefault(event, {})
+        if inspect.ismethod(callback):
+            # Don't keep the subscriber alive; drop the entry once it is collected
+            observers[key] = weakref.WeakMethod(
+                callback, lambda _ref: observers.pop(key, None)
+            )
+        else:
+            observers[key] = callback
     
     def unsubscribe(self, event: str, callback: Callable) -> None:
         """Unsubscribe from state changes"""
-        if event in self._observers:
-            self._observers[event] = [
-                cb for cb in self._observers[event] if cb != callback
-            ]
+        self._observers.get(event, {}).pop(_observer_key(callback), None)
     
     async def _notify(self, event: str, data: Any) -> None:
-        """Notify observers of state change"""
-        callbacks = self._observers.get(event, []) + self._observers.get("*", [])
-        for callback in callbacks:
+        """Queue an observer notification for the dispatcher"""
+        self._ensure_dispatcher()
+        try:
+            self._notify_queue.put_nowait((event, data))
+        except asyncio.QueueFull:
+            # Drop the oldest notification rather than block the caller
+            self._notify_queue.get_nowait()
+            self._notify_queue.task_done()
+            self._notify_queue.put_nowait((event, data))
+            logger.warning("Observer notification queue full, dropped oldest event")
+    
+    def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher task on the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and not self._dispatcher.done():
+            if self._dispatcher.get_loop() is loop:
+                return
+            self._dispatcher.cancel()
+            self._notify_queue = asyncio.Queue(maxsize=self._max_queued_notifications)
+        self._dispatcher = loop.create_task(self._dispatch_notifications())
+    
+    async def _dispatch_notifications(self) -> None:
+        """Deliver queued notifications to observers"""
+        while True:
+            event, data = await self._notify_queue.get()
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event, data)
-                else:
-                    callback(event, data)
-            except Exception as e:
-                logger.error(f"Observer callback error: {e}")
+                callbacks = (
+                    *self._observers.get(event, {}).values(),
+                    *self._observers.get("*", {}).values(),
+                )
+                await asyncio.gather(
+                    *(self._invoke_observer(cb, event, data) for cb in callbacks)
+                )
+            finally:
+                self._notify_queue.task_done()
+    
+    async def _invoke_observer(self, callback: Any, event: str, data: Any) -> None:
+        """Call a single observer, logging any error"""
+        if isinstance(callback, weakref.WeakMethod):
+            callback = callback()
+            if callback is None:
+                return
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                await callback(event, data)
+            else:
+                callback(event, data)
+        except Exception as e:
+            logger.error(f"Observer callback error: {e}")
+    
+    async def flush(self) -> None:
+        """Wait until all queued notifications have been delivered"""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            await self._notify_queue.join()
     
     def to_dict(self) -> Dict[str, Any]:
         """Export state as dictionary"""
@@ -287,7 +407,7 @@ class SystemState:
     
     def to_json(self) -> str:
         """Export state as JSON"""
-        return json.dumps(self.to_dict(), indent=2)
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode()
 
 
 # Global state singleton
@@ -8,7 +8,8 @@ import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import ModuleType
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional
 import logging
 import uuid
 
@@ -16,6 +17,13 @@ from ..config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Council is optional (requires openai)
+_council_mod: Optional[ModuleType]
+try:
+    from ..council import deliberation as _council_mod
+except ImportError:
+    _council_mod = None
+
 
 class VentureStatus(str, Enum):
     """Venture lifecycle status"""
@@ -85,6 +93,11 @@ class Venture:
     entity_type: Optional[str] = None  # "SASU", "LLC"
     jurisdiction: Optional[str] = None  # "France", "Wyoming"
     registration_id: Optional[str] = None
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # created_at never changes after construction
+        self._created_at_iso = self.created_at.isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -94,7 +107,7 @@ class Venture:
             "status": self.status.value,
             "market": self.market,
             "description": self.description,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_at_iso,
             "metrics": self.metrics.to_dict(),
             "entity_type": self.entity_type,
             "jurisdiction": self.jurisdiction,
@@ -112,6 +125,13 @@ class VentureManager:
     - Shutdown procedures
     """
     
+    _ACTIVE_STATUSES: ClassVar[FrozenSet[VentureStatus]] = frozenset({
+        VentureStatus.BUILDING,
+        VentureStatus.LAUNCHING,
+        VentureStatus.ACTIVE,
+        VentureStatus.SCALING,
+    })
+    
     def __init__(self, config=None, communication=None, council=None, wallet=None):
         if config is None:
             config = get_config().ventures
@@ -124,6 +144,10 @@ class VentureManager:
         # Ventures
         self.ventures: Dict[str, Venture] = {}
         
+        # Ventures in an active status, kept in sync by set_status(); a dict
+        # so iteration follows the order ventures became active
+        self._active: Dict[str, Venture] = {}
+        
         # Thresholds
         self.thresholds = {
             "min_validation_score": config.min_validation_score,
@@ -159,9 +183,8 @@ class VentureManager:
             Venture if approved, None if rejected
         """
         # Council deliberation if council available
-        if self.council and initial_investment > 0:
-            from ..council.deliberation import get_council
-            council = get_council()
+        if self.council and initial_investment > 0 and _council_mod:
+            council = _council_mod.get_council()
             
             result = await council.deliberate(
                 question=f"Should we launch new venture: {name}?",
@@ -193,6 +216,7 @@ class VentureManager:
         )
         
         self.ventures[venture.id] = venture
+        self.set_status(venture, venture.status)
         
         # Notify
         if self.communication:
@@ -251,9 +275,8 @@ class VentureManager:
     
     async def _consider_shutdown(self, venture: Venture) -> None:
         """Consider shutting down underperforming venture"""
-        if self.council:
-            from ..council.deliberation import get_council
-            council = get_council()
+        if self.council and _council_mod:
+            council = _council_mod.get_council()
             
             result = await council.deliberate(
                 question=f"Should we shut down {venture.name}?",
@@ -272,7 +295,7 @@ class VentureManager:
     async def _consider_scaling(self, venture: Venture) -> None:
         """Consider scaling a successful venture"""
         logger.info(f"Venture {venture.name} qualified for scaling review")
-        venture.status = VentureStatus.SCALING
+        self.set_status(venture, VentureStatus.SCALING)
         
         if self.communication:
             await self.communication.send(
@@ -286,7 +309,7 @@ class VentureManager:
             return False
         
         venture = self.ventures[venture_id]
-        venture.status = VentureStatus.SHUTDOWN
+        self.set_status(venture, VentureStatus.SHUTDOWN)
         
         if self.communication:
             await self.communication.send(
@@ -302,27 +325,42 @@ class VentureManager:
         logger.info(f"Venture shutdown: {venture.name} - {reason}")
         return True
     
+    def set_status(self, venture: Venture, status: VentureStatus) -> None:
+        """Transition venture status and keep the active index in sync"""
+        venture.status = status
+        if status in self._ACTIVE_STATUSES:
+            self._active.setdefault(venture.id, venture)
+        else:
+            self._active.pop(venture.id, None)
+    
     def get_active_ventures(self) -> List[Venture]:
         """Get all active ventures"""
-        active_statuses = {
-            VentureStatus.BUILDING,
-            VentureStatus.LAUNCHING,
-            VentureStatus.ACTIVE,
-            VentureStatus.SCALING,
-        }
-        return [v for v in self.ventures.values() if v.status in active_statuses]
+        return list(self._active.values())
+    
+    @property
+    def active_count(self) -> int:
+        """Number of active ventures (no list is built)"""
+        return len(self._active)
     
     def get_portfolio_summary(self) -> Dict[str, Any]:
         """Get portfolio summary"""
         active = self.get_active_ventures()
         
+        total_revenue = 0.0
+        total_expenses = 0.0
+        total_customers = 0
+        for v in active:
+            total_revenue += v.metrics.revenue
+            total_expenses += v.metrics.expenses
+            total_customers += v.metrics.customers
+        
         return {
             "total_ventures": len(self.ventures),
             "active_ventures": len(active),
-            "total_revenue": sum(v.metrics.revenue for v in active),
-            "total_expenses": sum(v.metrics.expenses for v in active),
-            "total_profit": sum(v.metrics.profit for v in active),
-            "total_customers": sum(v.metrics.customers for v in active),
+            "total_revenue": total_revenue,
+            "total_expenses": total_expenses,
+            "total_profit": total_revenue - total_expenses,
+            "total_customers": total_customers,
             "ventures": [v.to_dict() for v in active],
         }
 
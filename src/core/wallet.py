@@ -6,14 +6,25 @@ Supports USDC on Base L2 network.
 """
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Tuple
+import json
 import logging
+import sqlite3
+import threading
+import time
 import uuid
 
+from aiolimiter import AsyncLimiter
+
 from ..config import get_config
+from .http import get_aiohttp_session
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +32,29 @@ logger = logging.getLogger(__name__)
 try:
     from web3 import AsyncWeb3
     from eth_account import Account
+    from eth_abi import decode as abi_decode, encode as abi_encode
     WEB3_AVAILABLE = True
 except ImportError:
     WEB3_AVAILABLE = False
     logger.warning("web3 not installed. Run: pip install web3 eth-account")
 
 
+def _freeze_abi(abi: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Freeze an ABI: read-only entries, tuples for every nested list"""
+    def freeze(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: freeze(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return tuple(freeze(v) for v in value)
+        return value
+    
+    # web3 deep-copies nested components, so only top-level entries are
+    # wrapped in (unpicklable) mapping proxies
+    return tuple(MappingProxyType(freeze(entry)) for entry in abi)
+
+
 # ERC20 ABI for balanceOf and transfer
-ERC20_ABI = [
+ERC20_ABI = _freeze_abi([
     {
         "constant": True,
         "inputs": [{"name": "_owner", "type": "address"}],
@@ -46,10 +72,68 @@ ERC20_ABI = [
         "outputs": [{"name": "", "type": "bool"}],
         "type": "function"
     }
-]
+])
+
+# ERC20 function selectors (first 4 bytes of keccak256 of the signature)
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")  # transfer(address,uint256)
+
+# Chain IDs for the supported networks
+CHAIN_IDS = {
+    "base": 8453,
+    "ethereum": 1,
+    "polygon": 137,
+}
 
+# Multicall3 is deployed at the same address on Base, Ethereum and Polygon
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
-@dataclass
+MULTICALL3_ABI = _freeze_abi([
+    {
+        "inputs": [
+            {"name": "requireSuccess", "type": "bool"},
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "tryAggregate",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+])
+
+# USDC has 6 decimals; internal accounting is in integer micro-USDC
+USDC_UNIT = 1_000_000
+
+
+def to_micro_usdc(amount: Any) -> int:
+    """Convert a USD amount to integer micro-USDC"""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int(amount * USDC_UNIT)
+
+
+def normalize_addr(address: str) -> str:
+    """Canonical form used for address comparisons (lowercase hex)"""
+    return address.strip().lower()
+
+
+@dataclass(slots=True)
 class Transaction:
     """A wallet transaction"""
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
@@ -120,23 +204,82 @@ class WalletManager:
         self.max_single_tx = Decimal(str(config.limits.max_single_tx_usd))
         self.max_daily = Decimal(str(config.limits.max_daily_spend_usd))
         self.multisig_threshold = Decimal(str(config.multisig_threshold_usd))
+        self._max_single_tx_u = to_micro_usdc(self.max_single_tx)
+        self._max_daily_u = to_micro_usdc(self.max_daily)
+        self._multisig_threshold_u = to_micro_usdc(self.multisig_threshold)
+        
+        # Submission rate: short-term burst and sustained per-minute caps
+        self._send_burst_limiter = AsyncLimiter(
+            max_rate=config.limits.max_tx_per_second or 5, time_period=1
+        )
+        self._send_limiter = AsyncLimiter(
+            max_rate=config.limits.max_tx_per_minute or 30, time_period=60
+        )
+        
+        # Daily tracking (micro-USDC)
+        self._daily_spent_u = 0
+        self._daily_deadline = time.monotonic() + 86400.0
         
-        # Daily tracking
-        self.daily_spent = Decimal("0")
-        self.daily_reset_time = datetime.now()
+        # Approved addresses (normalized; replaced, not mutated, on change)
+        self.approved_addresses: FrozenSet[str] = frozenset(
+            normalize_addr(addr) for addr in (config.approved_addresses or [])
+        )
         
-        # Approved addresses
-        self.approved_addresses = set(
-            addr.lower() for addr in (config.approved_addresses or [])
+        # Transaction history: recent transactions in memory, full log in
+        # an append-only SQLite table (opened on first use, written off the
+        # event loop)
+        self.transactions: Deque[Transaction] = deque(
+            maxlen=config.transactions_in_memory or 1000
         )
+        self._db_path: Optional[str] = config.transactions_db_path or None
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
         
-        # Transaction history
-        self.transactions: List[Transaction] = []
+        # Balance cache: currency -> (balance, monotonic fetch time).
+        # Invalidated on every spend; a full refetch is forced every
+        # _bal_reset_frequency hits to bound drift from incoming transfers.
+        self._bal_cache: Dict[str, Tuple[float, float]] = {}
+        self._bal_ttl = 5.0
+        self._bal_reset_frequency = 100
+        self._bal_cache_hits = 0
         
         # Web3 connection
         self.w3: Optional[Any] = None
         self.account: Optional[Any] = None
         self.address: Optional[str] = None
+        
+        # USDC contract address for the active network, checksummed once
+        # in initialize()
+        self._usdc_checksum: Optional[str] = None
+        self._chain_id: Optional[int] = CHAIN_IDS.get(self.network)
+        
+        # Tracked tokens: currency -> (checksum address, decimals), all
+        # fetched together in one Multicall3 round-trip
+        self._tokens: Dict[str, Tuple[str, int]] = {}
+        self._multicall: Optional[Any] = None
+        
+        # Submitted transactions awaiting a receipt: tx_hash -> (tx, amount_u,
+        # event). Polled in batches by a background confirmer task.
+        self._pending_receipts: Dict[str, Tuple[Transaction, int, asyncio.Event]] = {}
+        self._confirm_interval = 2.0
+        self._confirm_timeout = 600.0
+        self._confirmer_task: Optional[asyncio.Task] = None
+        
+        # Locally tracked nonce (resynced from chain after a send error,
+        # once no other reserved nonce is still being sent) and gas price
+        # refreshed by a background poller
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        self._nonces_in_flight = 0
+        self._nonce_stale = False
+        self._gas_price: Optional[int] = None
+        self._gas_poll_interval = 5.0
+        self._gas_poller_task: Optional[asyncio.Task] = None
+    
+    @property
+    def daily_spent(self) -> Decimal:
+        """Amount spent in the current 24h window (USD)"""
+        return Decimal(self._daily_spent_u) / USDC_UNIT
     
     async def initialize(self) -> None:
         """Initialize wallet connection"""
@@ -148,7 +291,22 @@ class WalletManager:
         if not rpc_url:
             raise ValueError(f"Unknown network: {self.network}")
         
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+        provider = AsyncWeb3.AsyncHTTPProvider(rpc_url)
+        await provider.cache_async_session(await get_aiohttp_session())
+        self.w3 = AsyncWeb3(provider)
+        self._confirmer_task = asyncio.create_task(self._confirm_loop())
+        self._gas_poller_task = asyncio.create_task(self._gas_poller())
+        
+        usdc_address = self.usdc_contracts.get(self.network)
+        if usdc_address:
+            self._usdc_checksum = self.w3.to_checksum_address(usdc_address)
+            # USDC has 6 decimals
+            self._tokens["USDC"] = (self._usdc_checksum, 6)
+        
+        self._multicall = self.w3.eth.contract(
+            address=MULTICALL3_ADDRESS,
+            abi=MULTICALL3_ABI
+        )
         
         # Load account from private key
         import os
@@ -159,7 +317,7 @@ class WalletManager:
                 private_key = f"0x{private_key}"
             
             self.account = Account.from_key(private_key)
-            self.address = self.account.address
+            self.address = self.w3.to_checksum_address(self.account.address)
             logger.info(f"Wallet initialized: {self.address}")
         else:
             logger.warning(
@@ -172,28 +330,52 @@ class WalletManager:
         if not self.address:
             return {"USDC": 0.0}
         
+        now = time.monotonic()
+        if (
+            self._bal_cache
+            and self._bal_cache_hits < self._bal_reset_frequency
+            and all(now - ts < self._bal_ttl for _, ts in self._bal_cache.values())
+        ):
+            self._bal_cache_hits += 1
+            return {currency: value for currency, (value, _) in self._bal_cache.items()}
+        
         balances = {}
         
         try:
-            usdc_address = self.usdc_contracts.get(self.network)
-            if usdc_address and self.w3:
-                contract = self.w3.eth.contract(
-                    address=self.w3.to_checksum_address(usdc_address),
-                    abi=ERC20_ABI
-                )
-                
-                balance_wei = await contract.functions.balanceOf(
-                    self.address
-                ).call()
-                
-                # USDC has 6 decimals
-                balances["USDC"] = float(balance_wei) / 1_000_000
+            if self._tokens and self._multicall:
+                balances = await self._fetch_token_balances()
+                fetched_at = time.monotonic()
+                self._bal_cache = {
+                    currency: (value, fetched_at) for currency, value in balances.items()
+                }
+                self._bal_cache_hits = 0
         except Exception as e:
             logger.error(f"Error getting balance: {e}")
             balances["USDC"] = 0.0
         
         return balances
     
+    async def _fetch_token_balances(self) -> Dict[str, float]:
+        """Fetch balanceOf for every tracked token in a single Multicall3 call"""
+        currencies = list(self._tokens)
+        call_data = BALANCE_OF_SELECTOR + abi_encode(["address"], [self.address])
+        
+        results = await self._multicall.functions.tryAggregate(
+            False,
+            [(self._tokens[c][0], call_data) for c in currencies]
+        ).call()
+        
+        balances = {}
+        for currency, (success, return_data) in zip(currencies, results):
+            if not success:
+                logger.warning(f"balanceOf call failed for {currency}")
+                balances[currency] = 0.0
+                continue
+            (balance_wei,) = abi_decode(["uint256"], return_data)
+            balances[currency] = float(balance_wei) / 10 ** self._tokens[currency][1]
+        
+        return balances
+    
     async def send_payment(
         self,
         to_address: str,
@@ -218,26 +400,38 @@ class WalletManager:
         # Reset daily limit if needed
         self._check_daily_reset()
         
+        amount_u = to_micro_usdc(amount)
+        
         # Validate limits
-        if amount > self.max_single_tx:
+        if amount_u > self._max_single_tx_u:
             logger.warning(f"Transaction exceeds single tx limit: ${amount}")
             return None
         
-        if self.daily_spent + amount > self.max_daily:
+        if self._daily_spent_u + amount_u > self._max_daily_u:
             logger.warning(f"Transaction would exceed daily limit")
             return None
         
         # Check whitelist
         if not skip_whitelist and self.approved_addresses:
-            if to_address.lower() not in self.approved_addresses:
+            if normalize_addr(to_address) not in self.approved_addresses:
                 logger.warning(f"Address not in whitelist: {to_address}")
                 return None
         
         # Check multisig threshold
-        if amount > self.multisig_threshold:
+        if amount_u > self._multisig_threshold_u:
             logger.info(f"Amount ${amount} exceeds multisig threshold - requires approval")
             return None
         
+        # Throttle submissions (waits rather than rejects); only requests
+        # that passed the local checks spend rate tokens
+        await self._send_burst_limiter.acquire()
+        await self._send_limiter.acquire()
+        
+        # Sends that finished while this one waited count against the limit
+        if self._daily_spent_u + amount_u > self._max_daily_u:
+            logger.warning(f"Transaction would exceed daily limit")
+            return None
+        
         # Create transaction record
         tx = Transaction(
             type="send",
@@ -250,87 +444,306 @@ class WalletManager:
         
         # Execute if wallet is configured
         if self.w3 and self.account:
-            tx = await self._execute_transaction(tx)
+            tx = await self._execute_transaction(tx, amount_u)
         else:
             # Simulation mode
             tx.status = "simulated"
             logger.info(f"[SIMULATION] Would send ${amount} to {to_address}")
         
-        if tx.status in ("confirmed", "simulated"):
-            self.daily_spent += amount
+        # Submitted transfers count against the limit until they fail
+        if tx.status in ("submitted", "confirmed", "simulated"):
+            self._daily_spent_u += amount_u
+            self.invalidate_balance_cache()
         
         self.transactions.append(tx)
+        await self._persist_transactions([tx])
         return tx
     
-    async def _execute_transaction(self, tx: Transaction) -> Transaction:
-        """Execute actual blockchain transaction"""
+    async def _execute_transaction(self, tx: Transaction, amount_u: int) -> Transaction:
+        """Execute actual blockchain transaction (amount_u in micro-USDC)"""
+        reserved = False
         try:
-            usdc_address = self.usdc_contracts.get(self.network)
-            contract = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(usdc_address),
-                abi=ERC20_ABI
-            )
+            if self._usdc_checksum is None:
+                raise ValueError(f"No USDC contract configured for {self.network}")
             
-            # Amount in USDC units (6 decimals)
-            amount_wei = int(tx.amount * 1_000_000)
+            if self._chain_id is None:
+                self._chain_id = await self.w3.eth.chain_id
             
-            # Build transaction
-            nonce = await self.w3.eth.get_transaction_count(self.address)
-            gas_price = await self.w3.eth.gas_price
+            # Build transaction from the local nonce and cached gas price
+            nonce = await self._reserve_nonce()
+            reserved = True
             
-            tx_data = contract.functions.transfer(
-                self.w3.to_checksum_address(tx.to_address),
-                amount_wei
-            ).build_transaction({
-                'from': self.address,
+            gas_price = self._gas_price
+            if gas_price is None:
+                gas_price = await self.w3.eth.gas_price
+            
+            # transfer(to, amount) calldata, encoded directly
+            call_data = TRANSFER_SELECTOR + abi_encode(
+                ["address", "uint256"],
+                [self.w3.to_checksum_address(tx.to_address), amount_u]
+            )
+            
+            tx_data = {
+                'to': self._usdc_checksum,
+                'data': '0x' + call_data.hex(),
+                'value': 0,
                 'nonce': nonce,
                 'gasPrice': min(gas_price, self.config.max_gas_price_gwei * 10**9),
                 'gas': 100000,
-            })
+                'chainId': self._chain_id,
+            }
             
             # Sign
             signed = self.account.sign_transaction(tx_data)
             
             # Send
-            tx_hash = await self.w3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
             tx.tx_hash = tx_hash.hex()
             tx.status = "submitted"
             
-            # Wait for confirmation
-            receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            tx.status = "confirmed" if receipt.status == 1 else "failed"
-            logger.info(f"Transaction {tx.status}: {tx.tx_hash}")
+            # Confirmation is reconciled by the background confirmer
+            self._pending_receipts[tx.tx_hash] = (tx, amount_u, asyncio.Event())
+            logger.info(f"Transaction submitted: {tx.tx_hash}")
             
         except Exception as e:
             logger.error(f"Transaction error: {e}")
             tx.status = "failed"
+            # Local nonce may now be ahead of the chain
+            self._nonce_stale = True
+        
+        finally:
+            if reserved:
+                self._nonces_in_flight -= 1
+            # Resync only once no other reserved nonce is still being sent,
+            # otherwise a concurrent sender could be handed a duplicate
+            if self._nonce_stale and self._nonces_in_flight == 0:
+                self._nonce = None
+                self._nonce_stale = False
         
         return tx
     
+    async def _reserve_nonce(self) -> int:
+        """Take the next local nonce, syncing from chain under a lock"""
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+            nonce = self._nonce
+            self._nonce += 1
+            self._nonces_in_flight += 1
+            return nonce
+    
+    async def wait_for_confirmation(
+        self,
+        tx: Transaction,
+        timeout: Optional[float] = None,
+    ) -> Transaction:
+        """Wait until a submitted transaction is confirmed or failed"""
+        pending = self._pending_receipts.get(tx.tx_hash or "")
+        if pending:
+            await asyncio.wait_for(pending[2].wait(), timeout=timeout)
+        return tx
+    
+    async def _confirm_loop(self) -> None:
+        """Poll receipts for all submitted transactions in batches"""
+        while True:
+            await asyncio.sleep(self._confirm_interval)
+            if not self._pending_receipts:
+                continue
+            
+            try:
+                await self._reconcile_receipts()
+            except Exception as e:
+                logger.error(f"Receipt reconciliation error: {e}")
+    
+    async def _reconcile_receipts(self) -> None:
+        """Fetch receipts for pending transactions and settle their status"""
+        hashes = list(self._pending_receipts)
+        receipts = await asyncio.gather(
+            *(self.w3.eth.get_transaction_receipt(h) for h in hashes),
+            return_exceptions=True,
+        )
+        
+        now = datetime.now()
+        settled: List[Transaction] = []
+        for tx_hash, receipt in zip(hashes, receipts):
+            tx, amount_u, event = self._pending_receipts[tx_hash]
+            
+            if isinstance(receipt, Exception):
+                # Not mined yet (or transient RPC error)
+                age = (now - tx.timestamp).total_seconds()
+                if age > self._confirm_timeout:
+                    logger.warning(f"No receipt after {age:.0f}s, giving up: {tx_hash}")
+                    del self._pending_receipts[tx_hash]
+                    event.set()
+                continue
+            
+            tx.status = "confirmed" if receipt.status == 1 else "failed"
+            if tx.status == "failed":
+                self._daily_spent_u = max(0, self._daily_spent_u - amount_u)
+            self.invalidate_balance_cache()
+            settled.append(tx)
+            logger.info(f"Transaction {tx.status}: {tx_hash}")
+            
+            del self._pending_receipts[tx_hash]
+            event.set()
+        
+        if settled:
+            await self._persist_transactions(settled)
+    
+    async def _gas_poller(self) -> None:
+        """Keep a recent gas price cached off the send path"""
+        while True:
+            try:
+                self._gas_price = await self.w3.eth.gas_price
+            except Exception as e:
+                logger.warning(f"Gas price refresh failed: {e}")
+                self._gas_price = None
+            await asyncio.sleep(self._gas_poll_interval)
+    
+    async def close(self) -> None:
+        """Stop background tasks and close the transaction log"""
+        for task in (self._confirmer_task, self._gas_poller_task):
+            if task:
+                task.cancel()
+        self._confirmer_task = None
+        self._gas_poller_task = None
+        
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def invalidate_balance_cache(self) -> None:
+        """Force the next get_balances() call to hit the chain"""
+        self._bal_cache.clear()
+        self._bal_cache_hits = 0
+    
     def _check_daily_reset(self) -> None:
         """Reset daily spending if 24h passed"""
-        now = datetime.now()
-        if now - self.daily_reset_time > timedelta(hours=24):
-            self.daily_spent = Decimal("0")
-            self.daily_reset_time = now
+        now = time.monotonic()
+        if now > self._daily_deadline:
+            self._daily_spent_u = 0
+            self._daily_deadline = now + 86400.0
     
     def add_approved_address(self, address: str) -> None:
         """Add address to whitelist"""
-        self.approved_addresses.add(address.lower())
+        self.approved_addresses = self.approved_addresses | {normalize_addr(address)}
     
     def remove_approved_address(self, address: str) -> None:
         """Remove address from whitelist"""
-        self.approved_addresses.discard(address.lower())
+        self.approved_addresses = self.approved_addresses - {normalize_addr(address)}
     
     def get_transaction_history(self, limit: int = 100) -> List[Transaction]:
-        """Get recent transactions"""
-        return sorted(
-            self.transactions,
-            key=lambda t: t.timestamp,
-            reverse=True
-        )[:limit]
-
+        """Get recent transactions (blocking; async code uses fetch_transaction_history)"""
+        if limit <= 0:
+            return []
+        
+        # Appended in creation order, so the tail is already the most recent
+        if limit <= len(self.transactions) or self._db_path is None:
+            return list(islice(reversed(self.transactions), limit))
+        return self._read_transaction_log(limit)
+    
+    async def fetch_transaction_history(self, limit: int = 100) -> List[Transaction]:
+        """Get recent transactions, querying the log in a worker thread"""
+        if limit <= 0:
+            return []
+        
+        if limit <= len(self.transactions) or self._db_path is None:
+            return list(islice(reversed(self.transactions), limit))
+        return await asyncio.to_thread(self._read_transaction_log, limit)
+    
+    def _read_transaction_log(self, limit: int) -> List[Transaction]:
+        """Most recent transactions from the log, newest first (indexed on timestamp)"""
+        with self._db_lock:
+            db = self._transaction_log()
+            if db is None:
+                return list(islice(reversed(self.transactions), limit))
+            rows = db.execute(
+                "SELECT id, type, amount, currency, to_address, from_address, status, "
+                "timestamp, tx_hash, metadata FROM transactions "
+                "ORDER BY timestamp DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            Transaction(
+                id=row[0],
+                type=row[1],
+                amount=Decimal(row[2]),
+                currency=row[3],
+                to_address=row[4],
+                from_address=row[5],
+                status=row[6],
+                timestamp=datetime.fromisoformat(row[7]),
+                tx_hash=row[8],
+                metadata=json.loads(row[9]) if row[9] else None,
+            )
+            for row in rows
+        ]
+    
+    def _transaction_log(self) -> Optional[sqlite3.Connection]:
+        """Open (and create) the SQLite transaction log on first use"""
+        if self._db is not None or self._db_path is None:
+            return self._db
+        
+        try:
+            Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self._db_path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS transactions ("
+                "id TEXT PRIMARY KEY, type TEXT, amount TEXT, currency TEXT, "
+                "to_address TEXT, from_address TEXT, status TEXT, "
+                "timestamp TEXT, tx_hash TEXT, metadata TEXT)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_transactions_timestamp "
+                "ON transactions (timestamp)"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Transaction log unavailable ({self._db_path}): {e}")
+            self._db_path = None
+            return None
+        
+        self._db = db
+        return db
+    
+    async def _persist_transactions(self, txs: List[Transaction]) -> None:
+        """Write (or update the status of) transactions in the log"""
+        if self._db_path is None:
+            return
+        
+        # Rows are built on the loop so the worker thread never sees a
+        # transaction mid-update
+        rows = [
+            (
+                tx.id,
+                tx.type,
+                str(tx.amount),
+                tx.currency,
+                tx.to_address,
+                tx.from_address,
+                tx.status,
+                tx.timestamp.isoformat(),
+                tx.tx_hash,
+                json.dumps(tx.metadata, default=str) if tx.metadata else None,
+            )
+            for tx in txs
+        ]
+        await asyncio.to_thread(self._write_transaction_rows, rows)
+    
+    def _write_transaction_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Upsert transaction rows in one statement (runs in a worker thread)"""
+        with self._db_lock:
+            db = self._transaction_log()
+            if db is None:
+                return
+            try:
+                db.executemany(
+                    "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist {len(rows)} transaction(s): {e}")
 
 # Singleton
 _wallet: Optional[WalletManager] = None
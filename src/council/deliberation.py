@@ -6,20 +6,48 @@ Implements LLM Council pattern with voting and consensus.
 """
 
 import asyncio
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
 import logging
-import json
+import random
+import time
 
 import openai
+import orjson
+from aiolimiter import AsyncLimiter
 
 from ..config import get_config
+from ..core.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+SYSTEM_PROMPT_TEMPLATE = """You are a board member of QualiaIA, an autonomous AI business system.
+
+Your role is: {role}
+
+Analyze the following decision and provide your independent assessment.
+Consider:
+- Risk factors and potential downsides
+- Financial implications and ROI
+- Legal and compliance concerns
+- Strategic alignment with business goals
+- Market timing and opportunity cost
+
+You MUST respond with valid JSON in this exact format:
+{{
+    "vote": "approve" or "reject" or "abstain",
+    "confidence": 0.0 to 1.0,
+    "reasoning": "Your detailed reasoning (2-3 sentences)"
+}}
+
+Do not include any text outside the JSON object."""
+
+
+@dataclass(slots=True)
 class CouncilMember:
     """A member of the deliberation council"""
     model: str
@@ -27,7 +55,7 @@ class CouncilMember:
     weight: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Opinion:
     """A council member's opinion on a decision"""
     member: CouncilMember
@@ -35,6 +63,7 @@ class Opinion:
     confidence: float  # 0.0 to 1.0
     reasoning: str
     timestamp: datetime = field(default_factory=datetime.now)
+    failed: bool = False  # Stand-in for a timeout or API error
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -46,7 +75,7 @@ class Opinion:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DeliberationResult:
     """Result of council deliberation"""
     consensus: bool
@@ -101,6 +130,7 @@ class CouncilDeliberation:
         self.client = openai.AsyncOpenAI(
             base_url=config.base_url,
             api_key=config.api_key,
+            http_client=get_http_client(),
         )
         
         # Council members
@@ -125,8 +155,25 @@ class CouncilDeliberation:
                 CouncilMember("x-ai/grok-3", "Chairman", 1.5),
             ]
         
+        # System prompts only depend on the member's role
+        self._system_prompts = {
+            m.role: SYSTEM_PROMPT_TEMPLATE.format(role=m.role) for m in self.members
+        }
+        
         self.consensus_threshold = get_config().thresholds.consensus_required
         self.timeout = get_config().thresholds.council_timeout_seconds
+        
+        # Caps in-flight model calls, shared across concurrent deliberations
+        self._semaphore = asyncio.Semaphore(config.max_concurrent_opinions or 4)
+        
+        # Token bucket pacing requests to the OpenRouter per-key RPM
+        self._limiter = AsyncLimiter(max_rate=config.requests_per_minute, time_period=60)
+        
+        # LRU of recent results keyed by (question, context) digest, so
+        # retried deliberations don't re-query every council member
+        self._result_cache: "OrderedDict[str, Tuple[DeliberationResult, float, str]]" = OrderedDict()
+        self._result_cache_size = 256
+        self._result_cache_ttl = 3600.0
     
     async def deliberate(
         self,
@@ -148,6 +195,18 @@ class CouncilDeliberation:
         context = context or {}
         start_time = datetime.now()
         
+        cache_key = self._cache_key(question, context)
+        cached = self._result_cache.get(cache_key)
+        if cached and time.monotonic() - cached[1] < self._result_cache_ttl:
+            self._result_cache.move_to_end(cache_key)
+            logger.info(f"Council result cache hit: {question[:100]}...")
+            # A fresh copy per hit, timed as this call rather than the original
+            return replace(
+                cached[0],
+                opinions=list(cached[0].opinions),
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+            )
+        
         logger.info(f"Council deliberation started: {question[:100]}...")
         
         # Phase 1: Gather independent opinions
@@ -178,8 +237,35 @@ class CouncilDeliberation:
             f"consensus: {result.consensus})"
         )
         
+        # Don't pin a transient outage: results built from timeouts or API
+        # errors, or with no voting weight at all, are recomputed next time
+        if not any(o.failed for o in opinions) and self._tally(valid_opinions)[1] > 0:
+            self._result_cache[cache_key] = (
+                replace(result, opinions=list(result.opinions)), time.monotonic(), question
+            )
+            if len(self._result_cache) > self._result_cache_size:
+                self._result_cache.popitem(last=False)
+        
         return result
     
+    def invalidate(self, question: Optional[str] = None) -> None:
+        """Drop cached results for a question, or all cached results"""
+        if question is None:
+            self._result_cache.clear()
+            return
+        for key in [k for k, v in self._result_cache.items() if v[2] == question]:
+            del self._result_cache[key]
+    
+    @staticmethod
+    def _cache_key(question: str, context: Dict[str, Any]) -> str:
+        """Stable digest of a deliberation's inputs"""
+        payload = orjson.dumps(
+            {"q": question, "c": context},
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
     async def _gather_opinions(
         self,
         question: str,
@@ -187,96 +273,112 @@ class CouncilDeliberation:
     ) -> List[Opinion]:
         """Gather independent opinions from all council members"""
         
-        system_prompt = """You are a board member of QualiaIA, an autonomous AI business system.
-
-Your role is: {role}
-
-Analyze the following decision and provide your independent assessment.
-Consider:
-- Risk factors and potential downsides
-- Financial implications and ROI
-- Legal and compliance concerns
-- Strategic alignment with business goals
-- Market timing and opportunity cost
+        # Same user message for every member
+        context_str = "\n".join(f"- {k}: {v}" for k, v in context.items())
+        user_message = f"""Decision Question: {question}
 
-You MUST respond with valid JSON in this exact format:
-{{
-    "vote": "approve" or "reject" or "abstain",
-    "confidence": 0.0 to 1.0,
-    "reasoning": "Your detailed reasoning (2-3 sentences)"
-}}
+Context:
+{context_str}
 
-Do not include any text outside the JSON object."""
+Provide your assessment as JSON."""
 
-        tasks = []
-        for member in self.members:
-            task = self._get_opinion(member, system_prompt, question, context)
-            tasks.append(task)
-        
-        opinions = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = {
+            asyncio.create_task(
+                self._get_opinion(member, user_message)
+            ): member
+            for member in self.members
+        }
         
-        # Convert exceptions to error opinions
+        # Collect opinions as they arrive and stop once the outcome can no
+        # longer change, instead of waiting on the slowest member
         result = []
-        for i, opinion in enumerate(opinions):
-            if isinstance(opinion, Exception):
-                logger.error(f"Member {self.members[i].model} failed: {opinion}")
-                result.append(Opinion(
-                    member=self.members[i],
-                    vote="error",
-                    confidence=0.0,
-                    reasoning=str(opinion),
-                ))
-            else:
-                result.append(opinion)
-        
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    member = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        # Convert exceptions to error opinions
+                        logger.error(f"Member {member.model} failed: {error}")
+                        result.append(Opinion(
+                            member=member,
+                            vote="error",
+                            confidence=0.0,
+                            reasoning=str(error),
+                            failed=True,
+                        ))
+                    else:
+                        result.append(task.result())
+                
+                if pending and self._can_shortcircuit(result, [tasks[t] for t in pending]):
+                    logger.info(
+                        f"Council outcome settled early, skipping {len(pending)} member(s)"
+                    )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        # Keep council order for a stable synthesis
+        order = {id(member): i for i, member in enumerate(self.members)}
+        result.sort(key=lambda o: order[id(o.member)])
         return result
     
+    def _can_shortcircuit(
+        self,
+        opinions: List[Opinion],
+        remaining: List[CouncilMember],
+    ) -> bool:
+        """
+        Whether the consensus outcome is already decided.
+        
+        True if the current side still meets the threshold even when every
+        remaining member votes the other way at full weight.
+        """
+        remaining_weight = sum(m.weight for m in remaining)
+        approve_weight, total_weight, _ = self._tally(opinions)
+        
+        worst_total = total_weight + remaining_weight
+        if worst_total == 0:
+            return False
+        
+        # Approval holds even if everyone left rejects
+        if approve_weight / worst_total >= self.consensus_threshold:
+            return True
+        
+        # Rejection holds even if everyone left approves with full confidence
+        return 1 - (approve_weight + remaining_weight) / worst_total >= self.consensus_threshold
+    
     async def _get_opinion(
         self,
         member: CouncilMember,
-        system_prompt: str,
-        question: str,
-        context: Dict[str, Any],
+        user_message: str,
     ) -> Opinion:
         """Get opinion from a single council member"""
+        messages = [
+            {"role": "system", "content": self._system_prompts[member.role]},
+            {"role": "user", "content": user_message},
+        ]
         
-        # Format context
-        context_str = "\n".join(f"- {k}: {v}" for k, v in context.items())
-        
-        user_message = f"""Decision Question: {question}
-
-Context:
-{context_str}
-
-Provide your assessment as JSON."""
-
         try:
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(
-                    model=member.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt.format(role=member.role)},
-                        {"role": "user", "content": user_message},
-                    ],
-                    temperature=0.7,
-                    max_tokens=500,
-                ),
-                timeout=self.timeout,
-            )
-            
-            content = response.choices[0].message.content.strip()
+            content = await self._complete(member, messages)
             
-            # Parse JSON response
-            # Try to extract JSON from the response
             try:
-                result = json.loads(content)
-            except json.JSONDecodeError:
-                # Try to find JSON in the response
-                import re
-                json_match = re.search(r'\{[^{}]*\}', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
+                result = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Ask once more for a bare JSON object
+                messages += [
+                    {"role": "assistant", "content": content},
+                    {"role": "user", "content": "Your reply was not valid JSON. Respond with only the JSON object."},
+                ]
+                content = await self._complete(member, messages)
+                try:
+                    result = orjson.loads(content)
+                except orjson.JSONDecodeError:
                     raise ValueError(f"No valid JSON found in response: {content[:200]}")
             
             return Opinion(
@@ -293,6 +395,7 @@ Provide your assessment as JSON."""
                 vote="abstain",
                 confidence=0.0,
                 reasoning="Timeout - no response",
+                failed=True,
             )
         except Exception as e:
             logger.error(f"Error getting opinion from {member.model}: {e}")
@@ -301,8 +404,55 @@ Provide your assessment as JSON."""
                 vote="abstain",
                 confidence=0.0,
                 reasoning=f"Error: {e}",
+                failed=True,
             )
     
+    async def _complete(
+        self,
+        member: CouncilMember,
+        messages: List[Dict[str, str]],
+    ) -> str:
+        """Request a JSON completion from a council member's model"""
+        # Small jitter so parallel members don't hit the bucket in lockstep
+        await asyncio.sleep(random.uniform(0, 0.05))
+        async with self._semaphore, self._limiter:
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=member.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=500,
+                    response_format={"type": "json_object"},
+                ),
+                timeout=self.timeout,
+            )
+        
+        # orjson tolerates surrounding whitespace, so no strip() needed
+        return response.choices[0].message.content or ""
+    
+    @staticmethod
+    def _tally(opinions: List[Opinion]) -> Tuple[float, float, Tuple[int, int, int]]:
+        """
+        Tally votes in a single pass.
+        
+        Returns (confidence-weighted approval, total approve/reject weight,
+        (approve, reject, abstain) counts).
+        """
+        approve_weight = 0.0
+        total_weight = 0.0
+        approve_count = reject_count = abstain_count = 0
+        for o in opinions:
+            if o.vote == "approve":
+                approve_weight += o.member.weight * o.confidence
+                total_weight += o.member.weight
+                approve_count += 1
+            elif o.vote == "reject":
+                total_weight += o.member.weight
+                reject_count += 1
+            elif o.vote == "abstain":
+                abstain_count += 1
+        return approve_weight, total_weight, (approve_count, reject_count, abstain_count)
+    
     async def _synthesize(
         self,
         opinions: List[Opinion],
@@ -312,17 +462,7 @@ Provide your assessment as JSON."""
         """Synthesize final result from opinions"""
         
         # Calculate weighted votes
-        approve_weight = sum(
-            o.member.weight * o.confidence
-            for o in opinions
-            if o.vote == "approve"
-        )
-        reject_weight = sum(
-            o.member.weight * o.confidence
-            for o in opinions
-            if o.vote == "reject"
-        )
-        total_weight = sum(o.member.weight for o in opinions if o.vote in ("approve", "reject"))
+        approve_weight, total_weight, counts = self._tally(opinions)
         
         if total_weight == 0:
             # All abstained
@@ -352,7 +492,7 @@ Provide your assessment as JSON."""
             confidence = max(approve_ratio, 1 - approve_ratio)
         
         # Generate synthesis reasoning
-        reasoning = self._generate_synthesis(opinions, vote, approve_ratio)
+        reasoning = self._generate_synthesis(opinions, vote, approve_ratio, counts)
         
         return DeliberationResult(
             consensus=consensus,
@@ -368,15 +508,14 @@ Provide your assessment as JSON."""
         opinions: List[Opinion],
         vote: str,
         approve_ratio: float,
+        counts: Tuple[int, int, int],
     ) -> str:
         """Generate human-readable synthesis"""
         
         lines = []
         
         # Vote summary
-        approve_count = sum(1 for o in opinions if o.vote == "approve")
-        reject_count = sum(1 for o in opinions if o.vote == "reject")
-        abstain_count = sum(1 for o in opinions if o.vote == "abstain")
+        approve_count, reject_count, abstain_count = counts
         
         lines.append(f"Council Vote: {approve_count} approve, {reject_count} reject, {abstain_count} abstain")
         lines.append(f"Weighted approval: {approve_ratio:.0%}")
@@ -6,10 +6,14 @@ Helpers for RGPD/GDPR, CCPA, EU AI Act compliance.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from enum import Enum
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from enum import Enum, IntFlag
+import heapq
+import itertools
 import logging
 import json
+import time
 
 from ..config import get_config
 
@@ -33,6 +37,17 @@ class DataCategory(str, Enum):
     TECHNICAL = "technical"  # Logs, IPs, etc.
 
 
+class FranceCheck(IntFlag):
+    """France checks that gate overall compliance"""
+    RGPD = 1
+    DPIA = 2  # Completed, or not required
+    CNIL = 4
+    DPO = 8
+
+
+FRANCE_REQUIRED = FranceCheck.RGPD | FranceCheck.DPIA | FranceCheck.CNIL | FranceCheck.DPO
+
+
 @dataclass
 class DataProcessingRecord:
     """Record of data processing activity"""
@@ -64,61 +79,39 @@ class ConsentRecord:
     granted: bool
     timestamp: datetime = field(default_factory=datetime.now)
     expires_at: Optional[datetime] = None
+    # Set by ComplianceManager's expiry sweep
+    expired: bool = field(default=False, repr=False)
+    # Set when a newer record for the same user and purpose replaces this one
+    superseded: bool = field(default=False, repr=False)
+    # expires_at as a POSIX timestamp, compared against time.time()
+    _expires_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    # Whether the record is in ComplianceManager's active consent count
+    _counted: bool = field(default=False, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.expires_at is not None:
+            self._expires_ts = self.expires_at.timestamp()
     
     def is_valid(self) -> bool:
-        if not self.granted:
+        if not self.granted or self.expired or self.superseded:
             return False
-        if self.expires_at and datetime.now() > self.expires_at:
+        if self._expires_ts is not None and time.time() > self._expires_ts:
             return False
         return True
 
 
-class ComplianceManager:
-    """
-    Manages legal compliance for QualiaIA.
-    
-    Jurisdictions supported:
-    - France: RGPD (GDPR), CNIL requirements
-    - USA: CCPA (California), Colorado AI Act
-    - EU: AI Act (effective Aug 2026)
-    
-    Key compliance areas:
-    - Data protection and privacy
-    - AI transparency and explainability
-    - Automated decision-making disclosures
-    - Data subject rights
-    
-    TODO: For production deployment, consult with legal counsel to:
-    - Complete DPIA (Data Protection Impact Assessment)
-    - Register with CNIL if required
-    - Implement full data subject rights workflow
-    - Complete AI Act risk assessment
-    """
-    
-    def __init__(self):
-        self.config = get_config().compliance
-        
-        # Processing records
-        self.processing_records: List[DataProcessingRecord] = []
-        
-        # Consent records
-        self.consents: Dict[str, List[ConsentRecord]] = {}
-        
-        # Data retention policy
-        self.retention_policy = {
-            DataCategory.PERSONAL: 365,  # 1 year
-            DataCategory.SENSITIVE: 180,  # 6 months
-            DataCategory.FINANCIAL: 2555,  # 7 years (tax compliance)
-            DataCategory.TECHNICAL: 90,  # 3 months
-        }
-        
-        # Initialize required disclosures
-        self._setup_disclosures()
-    
-    def _setup_disclosures(self) -> None:
-        """Setup required legal disclosures"""
-        self.disclosures = {
-            "automated_decision": """
+def _freeze(value: Any) -> Any:
+    """Read-only view of a check result (dicts proxied, lists as tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Required legal disclosures (read-only, shared by all managers)
+DISCLOSURES: Mapping[str, str] = MappingProxyType({
+    "automated_decision": """
 AUTOMATED DECISION-MAKING DISCLOSURE
 
 QualiaIA uses automated decision-making systems powered by artificial 
@@ -135,7 +128,7 @@ You have the right to:
 
 Contact: [TODO: Set DPO_EMAIL in configuration]
 """,
-            "ai_transparency": """
+    "ai_transparency": """
 AI TRANSPARENCY NOTICE
 
 QualiaIA is an AI-powered autonomous business system that uses:
@@ -146,7 +139,7 @@ QualiaIA is an AI-powered autonomous business system that uses:
 Risk Classification: Limited (EU AI Act)
 Human Oversight: Enabled for decisions over $500 USD
 """,
-            "privacy_policy_summary": """
+    "privacy_policy_summary": """
 PRIVACY NOTICE SUMMARY
 
 Data We Collect:
@@ -160,91 +153,185 @@ Your Rights: Access, rectification, erasure, portability
 
 Full policy: [TODO: Set PRIVACY_POLICY_URL in configuration]
 """,
+})
+
+
+class ComplianceManager:
+    """
+    Manages legal compliance for QualiaIA.
+    
+    Jurisdictions supported:
+    - France: RGPD (GDPR), CNIL requirements
+    - USA: CCPA (California), Colorado AI Act
+    - EU: AI Act (effective Aug 2026)
+    
+    Key compliance areas:
+    - Data protection and privacy
+    - AI transparency and explainability
+    - Automated decision-making disclosures
+    - Data subject rights
+    
+    TODO: For production deployment, consult with legal counsel to:
+    - Complete DPIA (Data Protection Impact Assessment)
+    - Register with CNIL if required
+    - Implement full data subject rights workflow
+    - Complete AI Act risk assessment
+    """
+    
+    # Check method per jurisdiction (all take the jurisdiction)
+    _CHECKERS: ClassVar[Mapping[Jurisdiction, str]] = MappingProxyType({
+        Jurisdiction.FRANCE: "_check_france_compliance",
+        Jurisdiction.USA_CALIFORNIA: "_check_usa_compliance",
+        Jurisdiction.USA_COLORADO: "_check_usa_compliance",
+        Jurisdiction.EU: "_check_eu_ai_act",
+    })
+    
+    def __init__(self):
+        # Check results per jurisdiction, frozen and valid while the version
+        # matches (bumped whenever config is replaced or invalidated)
+        self._check_version = 0
+        self._check_cache: Dict[Jurisdiction, Tuple[int, Mapping[str, Any]]] = {}
+        self._report_jurisdictions: Optional[Tuple[int, Mapping[str, Any]]] = None
+        
+        self.config = get_config().compliance
+        
+        # Processing records
+        self.processing_records: List[DataProcessingRecord] = []
+        
+        # Consent records
+        self.consents: Dict[str, List[ConsentRecord]] = {}
+        
+        # Running count of valid consents; counted consents with an expiry
+        # sit in a min-heap so the sweep only pops the ones that lapsed
+        self._active_consent_count = 0
+        self._consent_expiry_heap: List[Tuple[datetime, int, ConsentRecord]] = []
+        self._consent_seq = itertools.count()
+        
+        # Data retention policy
+        self.retention_policy = {
+            DataCategory.PERSONAL: 365,  # 1 year
+            DataCategory.SENSITIVE: 180,  # 6 months
+            DataCategory.FINANCIAL: 2555,  # 7 years (tax compliance)
+            DataCategory.TECHNICAL: 90,  # 3 months
         }
+        
+        # Retention for every combination of categories (2^4 - 1 entries)
+        self._retention_by_categories: Dict[FrozenSet[DataCategory], int] = {
+            frozenset(combo): max(self.retention_policy[c] for c in combo)
+            for r in range(1, len(DataCategory) + 1)
+            for combo in itertools.combinations(DataCategory, r)
+        }
+        
+        # Processing record IDs: monotonic, seeded with the startup time
+        self._id_counter = itertools.count(int(time.time()))
+    
+    @property
+    def config(self) -> Any:
+        """Compliance config read by the jurisdiction checks"""
+        return self._config
     
-    def check_compliance(self, jurisdiction: Jurisdiction) -> Dict[str, Any]:
+    @config.setter
+    def config(self, value: Any) -> None:
+        self._config = value
+        self.invalidate_checks()
+    
+    def check_compliance(self, jurisdiction: Jurisdiction) -> Mapping[str, Any]:
         """
         Check compliance status for a jurisdiction.
         
-        Returns compliance checklist with status.
+        Returns a read-only compliance checklist with status.
         """
-        if jurisdiction == Jurisdiction.FRANCE:
-            return self._check_france_compliance()
-        elif jurisdiction in (Jurisdiction.USA_CALIFORNIA, Jurisdiction.USA_COLORADO):
-            return self._check_usa_compliance(jurisdiction)
-        elif jurisdiction == Jurisdiction.EU:
-            return self._check_eu_ai_act()
-        else:
+        checker = self._CHECKERS.get(jurisdiction)
+        if checker is None:
             return {"status": "unknown", "jurisdiction": jurisdiction.value}
+        
+        cached = self._check_cache.get(jurisdiction)
+        if cached is None or cached[0] != self._check_version:
+            # Frozen once here so hits can hand out the shared result
+            cached = (self._check_version, _freeze(getattr(self, checker)(jurisdiction)))
+            self._check_cache[jurisdiction] = cached
+        return cached[1]
     
-    def _check_france_compliance(self) -> Dict[str, Any]:
+    def invalidate_checks(self) -> None:
+        """Drop cached check results (call after editing config in place)"""
+        self._check_version += 1
+    
+    def _check_france_compliance(self, jurisdiction: Jurisdiction = Jurisdiction.FRANCE) -> Dict[str, Any]:
         """Check RGPD/CNIL compliance for France"""
         cfg = self.config.france
         
-        checks = {
+        bool_checks: Dict[str, bool] = {
             "rgpd_compliant": cfg.rgpd_compliant,
             "dpia_required": cfg.dpia_required,
             "dpia_completed": False,  # TODO: Track DPIA completion
             "cnil_registered": bool(cfg.cnil_registration),
-            "cnil_registration": cfg.cnil_registration or "TODO: Register with CNIL",
             "dpo_appointed": bool(cfg.dpo_email),
-            "dpo_email": cfg.dpo_email or "TODO: Appoint DPO",
             "data_retention_policy": True,
-            "retention_days": cfg.data_retention_days,
             "consent_management": True,
             "data_subject_rights": True,  # TODO: Implement full DSR workflow
         }
+        meta: Dict[str, Any] = {
+            "cnil_registration": cfg.cnil_registration or "TODO: Register with CNIL",
+            "dpo_email": cfg.dpo_email or "TODO: Appoint DPO",
+            "retention_days": cfg.data_retention_days,
+        }
         
-        all_compliant = all([
-            checks["rgpd_compliant"],
-            checks.get("dpia_completed", False) or not checks["dpia_required"],
-            checks["cnil_registered"],
-            checks["dpo_appointed"],
-        ])
+        status = (
+            (FranceCheck.RGPD if bool_checks["rgpd_compliant"] else 0)
+            | (FranceCheck.DPIA if bool_checks["dpia_completed"] or not bool_checks["dpia_required"] else 0)
+            | (FranceCheck.CNIL if bool_checks["cnil_registered"] else 0)
+            | (FranceCheck.DPO if bool_checks["dpo_appointed"] else 0)
+        )
         
         return {
             "jurisdiction": "France",
             "framework": "RGPD/GDPR + CNIL",
-            "compliant": all_compliant,
-            "checks": checks,
-            "actions_required": [
-                k for k, v in checks.items() 
-                if v is False or (isinstance(v, str) and v.startswith("TODO"))
-            ]
+            "compliant": status == FRANCE_REQUIRED,
+            "checks": {**bool_checks, **meta},
+            "actions_required": self._actions_required(bool_checks, meta),
         }
     
     def _check_usa_compliance(self, jurisdiction: Jurisdiction) -> Dict[str, Any]:
         """Check USA compliance (CCPA, Colorado AI Act)"""
         cfg = self.config.usa
         
-        checks = {
+        bool_checks: Dict[str, bool] = {
             "ccpa_compliant": cfg.ccpa_compliant,
             "privacy_policy": bool(cfg.privacy_policy_url),
-            "privacy_policy_url": cfg.privacy_policy_url or "TODO: Create privacy policy",
             "opt_out_mechanism": True,  # TODO: Implement
             "data_sale_disclosure": True,  # We don't sell data
         }
+        meta: Dict[str, Any] = {
+            "privacy_policy_url": cfg.privacy_policy_url or "TODO: Create privacy policy",
+        }
         
         if jurisdiction == Jurisdiction.USA_COLORADO:
-            checks.update({
+            bool_checks.update({
                 "colorado_ai_act": cfg.colorado_ai_act,
                 "ai_risk_assessment": False,  # TODO: Complete assessment
                 "admt_disclosure": True,  # Automated Decision Making Technology
-                "effective_date": "June 30, 2026",
             })
+            meta["effective_date"] = "June 30, 2026"
         
         return {
             "jurisdiction": jurisdiction.value,
             "framework": "CCPA/CPRA" + (" + Colorado AI Act" if jurisdiction == Jurisdiction.USA_COLORADO else ""),
-            "compliant": all(v is True for v in checks.values() if isinstance(v, bool)),
-            "checks": checks,
-            "actions_required": [
-                k for k, v in checks.items()
-                if v is False or (isinstance(v, str) and v.startswith("TODO"))
-            ]
+            "compliant": all(bool_checks.values()),
+            "checks": {**bool_checks, **meta},
+            "actions_required": self._actions_required(bool_checks, meta),
         }
     
-    def _check_eu_ai_act(self) -> Dict[str, Any]:
+    @staticmethod
+    def _actions_required(bool_checks: Dict[str, bool], meta: Dict[str, Any]) -> List[str]:
+        """Failed checks plus metadata fields still holding a TODO placeholder"""
+        actions = [k for k, v in bool_checks.items() if not v]
+        actions.extend(
+            k for k, v in meta.items()
+            if isinstance(v, str) and v.startswith("TODO")
+        )
+        return actions
+    
+    def _check_eu_ai_act(self, jurisdiction: Jurisdiction = Jurisdiction.EU) -> Dict[str, Any]:
         """Check EU AI Act compliance"""
         cfg = self.config.eu_ai_act
         
@@ -279,13 +366,15 @@ Full policy: [TODO: Set PRIVACY_POLICY_URL in configuration]
         recipients: List[str] = None,
     ) -> DataProcessingRecord:
         """Record a data processing activity (GDPR Article 30)"""
-        retention = max(
-            self.retention_policy.get(cat, 365)
-            for cat in data_categories
-        )
+        retention = self._retention_by_categories.get(frozenset(data_categories))
+        if retention is None:
+            retention = max(
+                self.retention_policy.get(cat, 365)
+                for cat in data_categories
+            )
         
         record = DataProcessingRecord(
-            id=f"proc_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            id=f"proc_{next(self._id_counter):x}",
             purpose=purpose,
             legal_basis=legal_basis,
             data_categories=data_categories,
@@ -296,25 +385,69 @@ Full policy: [TODO: Set PRIVACY_POLICY_URL in configuration]
         self.processing_records.append(record)
         return record
     
+    def add_consent(self, user_id: str, record: ConsentRecord) -> None:
+        """Store a consent record and update the active consent count"""
+        records = self.consents.setdefault(user_id, [])
+        
+        # A new grant or withdrawal replaces earlier records for the purpose
+        for previous in records:
+            if previous.purpose == record.purpose and not previous.superseded:
+                if previous._counted:
+                    previous._counted = False
+                    self._active_consent_count -= 1
+                previous.superseded = True
+        records.append(record)
+        
+        if record.is_valid():
+            record._counted = True
+            self._active_consent_count += 1
+            if record.expires_at is not None:
+                heapq.heappush(
+                    self._consent_expiry_heap,
+                    (record.expires_at, next(self._consent_seq), record),
+                )
+    
+    def sweep_expired_consents(self, now: Optional[datetime] = None) -> int:
+        """Mark and uncount consents that have expired since the last sweep"""
+        now = now or datetime.now()
+        heap = self._consent_expiry_heap
+        expired = 0
+        
+        while heap and heap[0][0] <= now:
+            _, _, record = heapq.heappop(heap)
+            record.expired = True
+            # Superseded records were uncounted when they were replaced
+            if record._counted:
+                record._counted = False
+                expired += 1
+        
+        self._active_consent_count -= expired
+        return expired
+    
     def get_disclosure(self, disclosure_type: str) -> str:
         """Get a required disclosure text"""
-        return self.disclosures.get(disclosure_type, "")
+        return DISCLOSURES.get(disclosure_type, "")
     
     def generate_compliance_report(self) -> Dict[str, Any]:
         """Generate comprehensive compliance report"""
+        self.sweep_expired_consents()
+        
+        # The jurisdictions section only changes with the check version
+        cached = self._report_jurisdictions
+        if cached is None or cached[0] != self._check_version:
+            cached = (self._check_version, MappingProxyType({
+                "france": self.check_compliance(Jurisdiction.FRANCE),
+                "usa_california": self.check_compliance(Jurisdiction.USA_CALIFORNIA),
+                "usa_colorado": self.check_compliance(Jurisdiction.USA_COLORADO),
+                "eu_ai_act": self.check_compliance(Jurisdiction.EU),
+            }))
+            self._report_jurisdictions = cached
+        
         return {
             "generated_at": datetime.now().isoformat(),
-            "jurisdictions": {
-                "france": self._check_france_compliance(),
-                "usa_california": self._check_usa_compliance(Jurisdiction.USA_CALIFORNIA),
-                "usa_colorado": self._check_usa_compliance(Jurisdiction.USA_COLORADO),
-                "eu_ai_act": self._check_eu_ai_act(),
-            },
+            "jurisdictions": cached[1],
             "processing_records": len(self.processing_records),
-            "active_consents": sum(
-                len([c for c in records if c.is_valid()])
-                for records in self.consents.values()
-            ),
+            "active_consents": self._active_consent_count,
         }
 
 
@@ -7,13 +7,15 @@ System orchestrator that initializes and coordinates all components.
 import asyncio
 import signal
 import sys
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
 import logging
 
+import orjson
 import structlog
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from prometheus_client import start_http_server, Counter, Gauge
+from prometheus_client import start_http_server, Counter, REGISTRY
+from prometheus_client.core import GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
 
 from .config import get_config, QualiaIAConfig
 from .core.state import get_state, SystemStatus
@@ -21,6 +23,13 @@ from .core.wallet import get_wallet
 from .core.ventures import get_venture_manager
 from .communication import get_hub, Priority
 from .council.deliberation import get_council
+from .core.http import close_http_clients
+
+
+def _orjson_serializer(obj, default=None, **kwargs) -> str:
+    """structlog JSON serializer backed by orjson (stdlib logging wants str)"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # Configure logging
 structlog.configure(
@@ -29,7 +38,7 @@ structlog.configure(
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_serializer)
     ],
     wrapper_class=structlog.stdlib.BoundLogger,
     context_class=dict,
@@ -41,9 +50,60 @@ logger = structlog.get_logger(__name__)
 # Prometheus metrics
 DECISIONS_TOTAL = Counter('qualiaIA_decisions_total', 'Total decisions', ['type', 'tier'])
 TRANSACTIONS_TOTAL = Counter('qualiaIA_transactions_total', 'Total transactions', ['status'])
-WALLET_BALANCE = Gauge('qualiaIA_wallet_balance_usd', 'Wallet balance in USD')
-VENTURES_ACTIVE = Gauge('qualiaIA_ventures_active', 'Number of active ventures')
-SYSTEM_UPTIME = Gauge('qualiaIA_uptime_seconds', 'System uptime in seconds')
+
+
+# Daily report layout, filled with format_map()
+DAILY_REPORT_TEMPLATE = """\
+📊 **QualiaIA Daily Report**
+📅 {date}
+
+**System**
+• Status: {status}
+• Uptime: {uptime}
+
+**Today's Activity**
+• Decisions: {decisions_total}
+  - Autonomous: {decisions_autonomous}
+  - Council: {decisions_council}
+  - Human: {decisions_human}
+• Revenue: ${revenue:,.2f}
+• Expenses: ${expenses:,.2f}
+• Profit: ${profit:,.2f}
+
+**Portfolio**
+• Active Ventures: {active_ventures}
+• Total Revenue: ${total_revenue:,.2f}
+• Total Profit: ${total_profit:,.2f}
+
+**Wallet**
+• Balance: ${balance:,.2f}"""
+
+
+class QualiaIACollector(Collector):
+    """Reads gauge values from the running system at scrape time"""
+    
+    def __init__(self, qualiaIA: "QualiaIA"):
+        self.qualiaIA = qualiaIA
+    
+    def collect(self) -> Iterator[Metric]:
+        state = self.qualiaIA.state
+        ventures = self.qualiaIA.ventures
+        
+        yield GaugeMetricFamily(
+            'qualiaIA_wallet_balance_usd',
+            'Wallet balance in USD',
+            value=float(sum(state.wallets.values())) if state.wallets else 0.0,
+        )
+        yield GaugeMetricFamily(
+            'qualiaIA_ventures_active',
+            'Number of active ventures',
+            value=ventures.active_count if ventures else 0,
+        )
+        yield GaugeMetricFamily(
+            'qualiaIA_uptime_seconds',
+            'System uptime in seconds',
+            value=state.uptime_seconds,
+        )
 
 
 class QualiaIA:
@@ -61,7 +121,7 @@ class QualiaIA:
     def __init__(self, config: Optional[QualiaIAConfig] = None):
         self.config = config or get_config()
         self.state = get_state()
-        self.scheduler = AsyncIOScheduler()
+        self._tasks: List[asyncio.Task] = []
         
         # Components (lazy initialized)
         self.hub = None
@@ -69,6 +129,9 @@ class QualiaIA:
         self.wallet = None
         self.ventures = None
         
+        # Scrape-time gauges (registered on start)
+        self._collector: Optional[QualiaIACollector] = None
+        
         # Shutdown event
         self._shutdown_event = asyncio.Event()
     
@@ -78,10 +141,12 @@ class QualiaIA:
         
         try:
             # Initialize state
-            await self.state.update(status=SystemStatus.INITIALIZING)
+            await self.state.set_status(SystemStatus.INITIALIZING)
             
             # Start Prometheus metrics server
             if self.config.monitoring.prometheus_enabled:
+                self._collector = QualiaIACollector(self)
+                REGISTRY.register(self._collector)
                 start_http_server(self.config.monitoring.prometheus_port)
                 logger.info(f"Prometheus metrics on port {self.config.monitoring.prometheus_port}")
             
@@ -107,19 +172,17 @@ class QualiaIA:
             # Update state with wallet balance
             balances = await self.wallet.get_balances()
             await self.state.update(wallets=balances)
-            WALLET_BALANCE.set(sum(balances.values()))
             
             # Setup scheduled tasks
             self._setup_scheduler()
-            self.scheduler.start()
             
             # System is running
-            await self.state.update(status=SystemStatus.RUNNING)
+            await self.state.set_status(SystemStatus.RUNNING)
             
             # Send startup notification
             await self.hub.send(
                 event_type="system_started",
-                message=f"🚀 QualiaIA system started\n\nWallet: ${sum(balances.values()):,.2f} USDC\nVentures: {len(self.ventures.get_active_ventures())}",
+                message=f"🚀 QualiaIA system started\n\nWallet: ${sum(balances.values()):,.2f} USDC\nVentures: {self.ventures.active_count}",
                 priority=Priority.STANDARD,
             )
             
@@ -130,14 +193,14 @@ class QualiaIA:
             
         except Exception as e:
             logger.error(f"Startup error: {e}")
-            await self.state.update(status=SystemStatus.ERROR)
+            await self.state.set_status(SystemStatus.ERROR)
             raise
     
     async def stop(self, reason: str = "Manual shutdown") -> None:
         """Gracefully shutdown the system"""
         logger.info(f"Shutting down QualiaIA: {reason}")
         
-        await self.state.update(status=SystemStatus.SHUTTING_DOWN)
+        await self.state.set_status(SystemStatus.SHUTTING_DOWN)
         
         # Notify before shutdown
         if self.hub:
@@ -147,15 +210,28 @@ class QualiaIA:
                 priority=Priority.URGENT,
             )
         
-        # Stop scheduler
-        if self.scheduler.running:
-            self.scheduler.shutdown()
+        # Stop scheduled tasks (but not the one running this shutdown)
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        self._tasks = []
         
         # Shutdown hub
         if self.hub:
             await self.hub.shutdown()
         
-        await self.state.update(status=SystemStatus.SHUTDOWN)
+        if self.wallet:
+            await self.wallet.close()
+        
+        # Close pooled HTTP connections
+        await close_http_clients()
+        
+        if self._collector:
+            REGISTRY.unregister(self._collector)
+            self._collector = None
+        
+        await self.state.set_status(SystemStatus.SHUTDOWN)
         self._shutdown_event.set()
         
         logger.info("QualiaIA shutdown complete")
@@ -173,75 +249,87 @@ class QualiaIA:
         """Setup scheduled tasks"""
         cfg = self.config.scheduler
         
-        # Daily report
-        self.scheduler.add_job(
-            self._daily_report,
-            'cron',
-            hour=cfg.daily_report_hour,
-            minute=cfg.daily_report_minute,
-            id='daily_report'
-        )
-        
-        # Health check
-        self.scheduler.add_job(
-            self._health_check,
-            'interval',
-            seconds=cfg.health_check_interval,
-            id='health_check'
-        )
-        
-        # Balance check
-        self.scheduler.add_job(
-            self._balance_check,
-            'interval',
-            seconds=cfg.balance_check_interval,
-            id='balance_check'
-        )
-        
-        # Metrics update
-        self.scheduler.add_job(
-            self._update_metrics,
-            'interval',
-            seconds=60,
-            id='metrics_update'
-        )
+        self._tasks = [
+            # Daily report
+            asyncio.create_task(self._daily(
+                cfg.daily_report_hour, cfg.daily_report_minute, self._daily_report
+            ), name='daily_report'),
+            # Health check
+            asyncio.create_task(self._periodic(
+                cfg.health_check_interval, self._health_check
+            ), name='health_check'),
+            # Balance check
+            asyncio.create_task(self._periodic(
+                cfg.balance_check_interval, self._balance_check
+            ), name='balance_check'),
+            # Venture state sync
+            asyncio.create_task(self._periodic(
+                60, self._sync_ventures
+            ), name='venture_sync'),
+            # Pending decision expiry
+            asyncio.create_task(self._periodic(
+                60, self._sweep_expired_decisions
+            ), name='decision_expiry'),
+        ]
         
         logger.info("Scheduler configured with periodic tasks")
     
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless shutdown is requested first; True if still running"""
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=seconds)
+            return False
+        except asyncio.TimeoutError:
+            return True
+    
+    async def _run_job(self, job: Callable[[], Awaitable[None]]) -> None:
+        """Run a scheduled job, logging (not propagating) its errors"""
+        try:
+            await job()
+        except Exception as e:
+            logger.error(f"Scheduled job {job.__name__} failed: {e}")
+    
+    async def _periodic(self, interval: float, job: Callable[[], Awaitable[None]]) -> None:
+        """Run a job every `interval` seconds until shutdown"""
+        while await self._sleep(interval):
+            await self._run_job(job)
+    
+    async def _daily(self, hour: int, minute: int, job: Callable[[], Awaitable[None]]) -> None:
+        """Run a job every day at hour:minute (local time) until shutdown"""
+        while True:
+            now = datetime.now()
+            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            if not await self._sleep((next_run - now).total_seconds()):
+                return
+            await self._run_job(job)
+    
     async def _daily_report(self) -> None:
         """Send daily summary report"""
         state = self.state
         ventures = self.ventures.get_portfolio_summary() if self.ventures else {}
         
-        report = f"""
-📊 **QualiaIA Daily Report**
-📅 {datetime.now().strftime('%Y-%m-%d')}
-
-**System**
-• Status: {state.status.value}
-• Uptime: {state.uptime}
-
-**Today's Activity**
-• Decisions: {state.today.decisions_total}
-  - Autonomous: {state.today.decisions_autonomous}
-  - Council: {state.today.decisions_council}
-  - Human: {state.today.decisions_human}
-• Revenue: ${state.today.revenue:,.2f}
-• Expenses: ${state.today.expenses:,.2f}
-• Profit: ${state.today.profit:,.2f}
-
-**Portfolio**
-• Active Ventures: {ventures.get('active_ventures', 0)}
-• Total Revenue: ${ventures.get('total_revenue', 0):,.2f}
-• Total Profit: ${ventures.get('total_profit', 0):,.2f}
-
-**Wallet**
-• Balance: ${sum(state.wallets.values()) if state.wallets else 0:,.2f}
-"""
+        report = DAILY_REPORT_TEMPLATE.format_map({
+            "date": datetime.now().strftime('%Y-%m-%d'),
+            "status": state.status.value,
+            "uptime": state.uptime,
+            "decisions_total": state.today.decisions_total,
+            "decisions_autonomous": state.today.decisions_autonomous,
+            "decisions_council": state.today.decisions_council,
+            "decisions_human": state.today.decisions_human,
+            "revenue": state.today.revenue,
+            "expenses": state.today.expenses,
+            "profit": state.today.profit,
+            "active_ventures": ventures.get('active_ventures', 0),
+            "total_revenue": ventures.get('total_revenue', 0),
+            "total_profit": ventures.get('total_profit', 0),
+            "balance": sum(state.wallets.values()) if state.wallets else 0,
+        })
         
         await self.hub.send(
             event_type="daily_report",
-            message=report.strip(),
+            message=report,
             priority=Priority.ASYNC,
         )
         
@@ -250,43 +338,50 @@ class QualiaIA:
     
     async def _health_check(self) -> None:
         """Periodic health check"""
-        # Check wallet balance
-        if self.wallet:
-            balances = await self.wallet.get_balances()
-            total = sum(balances.values())
-            
+        alerts: List[Tuple[str, str]] = []
+        
+        # Check wallet balance (refreshed in state by _balance_check)
+        if self.wallet and self.state.wallets:
+            total = sum(self.state.wallets.values())
             threshold = self.config.monitoring.alerts.wallet_low_balance_usd
             if total < threshold:
-                await self.hub.send(
-                    event_type="wallet_balance_low",
-                    message=f"⚠️ Low wallet balance: ${total:,.2f}\n\nThreshold: ${threshold:,.2f}",
-                    priority=Priority.URGENT,
-                )
+                alerts.append((
+                    "wallet_balance_low",
+                    f"⚠️ Low wallet balance: ${total:,.2f}\n\nThreshold: ${threshold:,.2f}",
+                ))
         
         # Check error rate
         if self.state.today.decisions_total > 0:
             error_rate = self.state.today.errors_count / self.state.today.decisions_total
             if error_rate > self.config.monitoring.alerts.error_rate_threshold:
-                await self.hub.send(
-                    event_type="error_rate_high",
-                    message=f"⚠️ High error rate: {error_rate:.1%}",
-                    priority=Priority.URGENT,
-                )
+                alerts.append(("error_rate_high", f"⚠️ High error rate: {error_rate:.1%}"))
+        
+        if not alerts:
+            return
+        
+        # Several alerts on the same tick go out as one message
+        event_type = alerts[0][0] if len(alerts) == 1 else "health_alerts"
+        await self.hub.send(
+            event_type=event_type,
+            message="\n\n".join(message for _, message in alerts),
+            priority=Priority.URGENT,
+        )
     
     async def _balance_check(self) -> None:
         """Update wallet balance in state"""
         if self.wallet:
             balances = await self.wallet.get_balances()
             await self.state.update(wallets=balances)
-            WALLET_BALANCE.set(sum(balances.values()))
     
-    async def _update_metrics(self) -> None:
-        """Update Prometheus metrics"""
-        SYSTEM_UPTIME.set(self.state.uptime_seconds)
-        
+    async def _sweep_expired_decisions(self) -> None:
+        """Time out pending decisions past their deadline"""
+        expired = await self.state.sweep_expired()
+        for decision in expired:
+            logger.info(f"Decision timed out: {decision.id} ({decision.action})")
+    
+    async def _sync_ventures(self) -> None:
+        """Mirror active ventures into system state"""
         if self.ventures:
-            active = len(self.ventures.get_active_ventures())
-            VENTURES_ACTIVE.set(active)
             await self.state.update(ventures=[v.to_dict() for v in self.ventures.get_active_ventures()])
     
     async def make_decision(
@@ -308,6 +403,7 @@ class QualiaIA:
         """
         context = context or {}
         thresholds = self.config.thresholds
+        result = None
         
         # Tier 1: Autonomous
         if amount < thresholds.auto_approve_usd:
@@ -340,8 +436,8 @@ class QualiaIA:
             action=action,
             amount=amount if amount > 0 else None,
             reason=context.get("reason", "Requires human approval"),
-            council_recommendation=result.vote if 'result' in locals() else None,
-            council_confidence=result.confidence if 'result' in locals() else None,
+            council_recommendation=result.vote if result is not None else None,
+            council_confidence=result.confidence if result is not None else None,
         )
         
         await self.state.record_decision("human")
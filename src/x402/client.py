@@ -9,66 +9,155 @@ Reference: https://github.com/coinbase/x402
 """
 
 import asyncio
-import base64
-import json
+from binascii import a2b_base64, b2a_base64
+from collections import deque
+import importlib.util
 import time
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Deque, Dict, List, Optional, Tuple
 import logging
 import uuid
 
 import aiohttp
+import orjson
 
 from ..config import get_config
+from .nonce import new_nonce
 
 logger = logging.getLogger(__name__)
 
-# Try to import eth_account for EIP-712 signing
-try:
-    from eth_account import Account
-    from eth_account.messages import encode_typed_data
-    ETH_ACCOUNT_AVAILABLE = True
-except ImportError:
-    ETH_ACCOUNT_AVAILABLE = False
+# eth_account (EIP-712 signing) is imported on first use, not at startup
+ETH_ACCOUNT_AVAILABLE = importlib.util.find_spec("eth_account") is not None
+if not ETH_ACCOUNT_AVAILABLE:
     logger.warning("eth_account not available. Run: pip install eth-account")
 
+_account_cls: Optional[Any] = None
+_codec: Optional[Tuple[Any, Any]] = None
+_eip712_hashes: Optional[Tuple[bytes, bytes]] = None
+
+
+def _eth_account() -> Any:
+    """Import eth_account lazily; returns the Account class"""
+    global _account_cls
+    if _account_cls is None:
+        from eth_account import Account
+        _account_cls = Account
+    return _account_cls
+
+
+def _eth_codec() -> Tuple[Any, Any]:
+    """Import the ABI encoder and keccak lazily; returns (encode, keccak)"""
+    global _codec
+    if _codec is None:
+        from eth_abi import encode
+        from eth_utils import keccak
+        _codec = (encode, keccak)
+    return _codec
+
+
+def _x402_hashes() -> Tuple[bytes, bytes]:
+    """EIP-712 domain separator and PaymentAuthorization type hash (computed once)"""
+    global _eip712_hashes
+    if _eip712_hashes is None:
+        encode, keccak = _eth_codec()
+        domain_separator = keccak(encode(
+            ["bytes32", "bytes32", "bytes32", "uint256"],
+            [
+                keccak(text="EIP712Domain(string name,string version,uint256 chainId)"),
+                keccak(text=X402_DOMAIN["name"]),
+                keccak(text=X402_DOMAIN["version"]),
+                X402_DOMAIN["chainId"],
+            ],
+        ))
+        type_hash = keccak(text=(
+            "PaymentAuthorization(address recipient,uint256 amount,address token,"
+            "uint256 validAfter,uint256 validBefore,bytes32 nonce)"
+        ))
+        _eip712_hashes = (domain_separator, type_hash)
+    return _eip712_hashes
+
+
+def payment_authorization_digest(
+    recipient: str,
+    amount: int,
+    token: str,
+    valid_after: int,
+    valid_before: int,
+    nonce: bytes,
+) -> bytes:
+    """EIP-712 digest of a PaymentAuthorization (keccak(0x1901 || domain || struct))"""
+    encode, keccak = _eth_codec()
+    domain_separator, type_hash = _x402_hashes()
+    struct_hash = keccak(encode(
+        ["bytes32", "address", "uint256", "address", "uint256", "uint256", "bytes32"],
+        [type_hash, recipient, amount, token, valid_after, valid_before, nonce],
+    ))
+    return keccak(b"\x19\x01" + domain_separator + struct_hash)
+
 
 # =============================================================================
 # x402 Protocol Constants
 # =============================================================================
 
-# EIP-712 Domain for x402 payments on Base
-X402_DOMAIN = {
+# EIP-712 Domain for x402 payments on Base (read-only)
+X402_DOMAIN = MappingProxyType({
     "name": "x402",
     "version": "1",
     "chainId": 8453,  # Base mainnet
-}
-
-# EIP-712 Types for payment authorization
-X402_TYPES = {
-    "EIP712Domain": [
-        {"name": "name", "type": "string"},
-        {"name": "version", "type": "string"},
-        {"name": "chainId", "type": "uint256"},
-    ],
-    "PaymentAuthorization": [
-        {"name": "recipient", "type": "address"},
-        {"name": "amount", "type": "uint256"},
-        {"name": "token", "type": "address"},
-        {"name": "validAfter", "type": "uint256"},
-        {"name": "validBefore", "type": "uint256"},
-        {"name": "nonce", "type": "bytes32"},
-    ],
-}
+})
+
+# EIP-712 Types for payment authorization (read-only)
+X402_TYPES = MappingProxyType({
+    "EIP712Domain": (
+        MappingProxyType({"name": "name", "type": "string"}),
+        MappingProxyType({"name": "version", "type": "string"}),
+        MappingProxyType({"name": "chainId", "type": "uint256"}),
+    ),
+    "PaymentAuthorization": (
+        MappingProxyType({"name": "recipient", "type": "address"}),
+        MappingProxyType({"name": "amount", "type": "uint256"}),
+        MappingProxyType({"name": "token", "type": "address"}),
+        MappingProxyType({"name": "validAfter", "type": "uint256"}),
+        MappingProxyType({"name": "validBefore", "type": "uint256"}),
+        MappingProxyType({"name": "nonce", "type": "bytes32"}),
+    ),
+})
 
 # USDC contract on Base
 USDC_BASE = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
 
+# USDC has 6 decimals
+_USDC_SCALE = Decimal(1_000_000)
+_ZERO = Decimal("0")
+
+
+def encode_payment_header(data: Dict[str, Any]) -> str:
+    """Encode an x402 header value (base64 of compact JSON)"""
+    return b2a_base64(orjson.dumps(data), newline=False).decode()
+
 
-@dataclass
+def decode_payment_header(value: str, strict: bool = False) -> Any:
+    """Decode an x402 header value (strict rejects non-base64 input)"""
+    return orjson.loads(a2b_base64(value, strict_mode=strict))
+
+
+# Replayed 402 headers (same nonce) decode once; the decoded dict is only
+# read, and hire_agent refuses requirements past validUntil before signing
+_decode_requirement_header = lru_cache(maxsize=4096)(decode_payment_header)
+
+
+def _json_dumps(obj: Any) -> str:
+    """orjson encoder for aiohttp (which expects str)"""
+    return orjson.dumps(obj).decode()
+
+
+@dataclass(slots=True)
 class PaymentRequirement:
     """Payment details from 402 response"""
     recipient: str
@@ -78,23 +167,26 @@ class PaymentRequirement:
     valid_until: int
     nonce: str
     description: Optional[str] = None
+    # Amount in USD (USDC has 6 decimals)
+    amount_usd: Decimal = field(init=False, repr=False, compare=False)
+    _nonce_bytes: bytes = field(init=False, repr=False, compare=False)
     
-    @property
-    def amount_usd(self) -> Decimal:
-        """Amount in USD (USDC has 6 decimals)"""
-        return Decimal(self.amount) / Decimal(10**6)
+    def __post_init__(self):
+        # Derived once here rather than on every use
+        self.amount_usd = Decimal(self.amount) / _USDC_SCALE
+        self._nonce_bytes = bytes.fromhex(self.nonce.removeprefix("0x"))
     
     @classmethod
     def from_header(cls, header_value: str) -> "PaymentRequirement":
         """Parse from X-Payment-Required header"""
-        data = json.loads(base64.b64decode(header_value))
+        data = _decode_requirement_header(header_value)
         return cls(
             recipient=data["recipient"],
             amount=int(data["amount"]),
             token=data.get("token", USDC_BASE),
             network=data.get("network", "base"),
             valid_until=int(data.get("validUntil", time.time() + 300)),
-            nonce=data.get("nonce", os.urandom(32).hex()),
+            nonce=data["nonce"] if "nonce" in data else new_nonce(),
             description=data.get("description"),
         )
     
@@ -108,18 +200,18 @@ class PaymentRequirement:
             token=payment.get("token", USDC_BASE),
             network=payment.get("network", "base"),
             valid_until=int(payment.get("validUntil", time.time() + 300)),
-            nonce=payment.get("nonce", os.urandom(32).hex()),
+            nonce=payment["nonce"] if "nonce" in payment else new_nonce(),
             description=payment.get("description"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentHire:
     """Record of hiring an external AI agent"""
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     service_url: str = ""
     task: str = ""
-    max_payment: Decimal = Decimal("0")
+    max_payment: Decimal = _ZERO
     actual_payment: Optional[Decimal] = None
     status: str = "pending"  # pending, paying, completed, failed, rejected
     result: Optional[Dict[str, Any]] = None
@@ -127,6 +219,11 @@ class AgentHire:
     tx_hash: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # created_at never changes after construction
+        self._created_at_iso = self.created_at.isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -138,7 +235,7 @@ class AgentHire:
             "status": self.status,
             "error": self.error,
             "tx_hash": self.tx_hash,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_at_iso,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
 
@@ -176,7 +273,7 @@ class X402Client:
         self.facilitator_url = config.facilitator_url
         self.max_hire = Decimal(str(config.max_agent_hire_usd))
         self.max_daily = config.max_daily_hires
-        self.trusted_services = set(config.trusted_services or [])
+        self.trusted_services = config.trusted_services or []
         
         # Wallet for signing
         self.account = None
@@ -184,14 +281,22 @@ class X402Client:
         
         # Daily tracking
         self.daily_hires = 0
-        self.daily_spend = Decimal("0")
-        self.daily_reset = datetime.now()
+        self.daily_spend = _ZERO
+        self._daily_reset_ts = time.monotonic()
+        self._reset_handle: Optional[asyncio.TimerHandle] = None
         
-        # Hire history
-        self.hires: List[AgentHire] = []
+        # Hire history (last 1000)
+        self.hires: Deque[AgentHire] = deque(maxlen=1000)
         
         # HTTP session
         self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Paid requests in flight, keyed by (service_url, nonce)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # Caps concurrent hire_agent calls
+        self._hire_slots = asyncio.Semaphore(config.max_concurrent_hires or 16)
+        self._hires_in_progress = 0
     
     def _load_account(self) -> None:
         """Load signing account from private key"""
@@ -204,6 +309,7 @@ class X402Client:
             if not private_key.startswith("0x"):
                 private_key = f"0x{private_key}"
             try:
+                Account = _eth_account()
                 self.account = Account.from_key(private_key)
                 logger.info(f"x402 signing enabled for address: {self.account.address}")
             except Exception as e:
@@ -216,13 +322,30 @@ class X402Client:
     
     async def initialize(self) -> None:
         """Initialize HTTP session"""
+        # Pooled keep-alive connections so the 402 -> paid request round
+        # trip to the same service reuses one TCP/TLS connection
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True,
+        )
         self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60)
+            connector=connector,
+            headers={"Accept": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=60),
+            json_serialize=_json_dumps,
         )
+        if self._reset_handle is None:
+            self._schedule_daily_reset()
         logger.info("x402 client initialized")
     
     async def close(self) -> None:
-        """Close HTTP session"""
+        """Close HTTP session (and its connector)"""
+        if self._reset_handle:
+            self._reset_handle.cancel()
+            self._reset_handle = None
         if self.session:
             await self.session.close()
             self.session = None
@@ -255,96 +378,144 @@ class X402Client:
             max_payment=max_payment,
         )
         
+        # Reject invalid hires before queueing for a slot
         try:
-            # Validate
             self._validate_hire(hire, trust_override)
-            
-            # Ensure session
-            if not self.session:
-                await self.initialize()
-            
-            # Step 1: Initial request to get payment requirements
-            logger.info(f"x402: Requesting service {service_url}")
-            payment_req = await self._request_service(service_url, task, parameters)
-            
-            if payment_req is None:
-                # Service didn't require payment - free!
-                hire.status = "completed"
-                hire.actual_payment = Decimal("0")
-                hire.completed_at = datetime.now()
-                self._record_hire(hire)
-                return hire
-            
-            # Step 2: Check if payment is acceptable
-            required_usd = payment_req.amount_usd
-            logger.info(f"x402: Service requires ${required_usd} USDC")
-            
-            if required_usd > max_payment:
-                hire.status = "rejected"
-                hire.error = f"Service requires ${required_usd}, max is ${max_payment}"
-                logger.warning(hire.error)
-                self._record_hire(hire)
-                return hire
-            
-            # Step 3: Sign the payment
-            hire.status = "paying"
-            payment_header = self._sign_payment(payment_req)
-            
-            if not payment_header:
+        except ValueError as e:
+            hire.status = "failed"
+            hire.error = str(e)
+            logger.error(f"x402 hire failed: {e}")
+            self._record_hire(hire)
+            return hire
+        
+        # Bound concurrent hires so bursts queue instead of piling onto
+        # the connector and the signing path
+        async with self._hire_slots:
+            # Hires queued behind the slot were validated against a stale
+            # count; recheck, counting hires that may still be paid for
+            self._check_daily_reset()
+            if self.daily_hires + self._hires_in_progress >= self.max_daily:
                 hire.status = "failed"
-                hire.error = "Failed to sign payment - check WALLET_PRIVATE_KEY"
+                hire.error = f"Daily hire limit reached ({self.max_daily})"
+                logger.error(f"x402 hire failed: {hire.error}")
                 self._record_hire(hire)
                 return hire
             
-            # Step 4: Make the paid request
-            logger.info(f"x402: Sending payment authorization to {service_url}")
-            result = await self._make_paid_request(
-                service_url, task, parameters, payment_header
-            )
-            
-            # Success!
-            hire.status = "completed"
-            hire.actual_payment = required_usd
-            hire.result = result
-            hire.completed_at = datetime.now()
-            
-            # Update daily tracking
-            self.daily_hires += 1
-            self.daily_spend += required_usd
-            
-            logger.info(f"x402: Hire {hire.id} completed, paid ${required_usd}")
+            self._hires_in_progress += 1
+            try:
+                # Ensure session
+                if not self.session:
+                    await self.initialize()
+                
+                # Step 1: Initial request to get payment requirements
+                logger.info(f"x402: Requesting service {service_url}")
+                payment_req = await self._request_service(service_url, task, parameters)
+                
+                if payment_req is None:
+                    # Service didn't require payment - free!
+                    hire.status = "completed"
+                    hire.actual_payment = _ZERO
+                    hire.completed_at = datetime.now()
+                    self._record_hire(hire)
+                    return hire
+                
+                # Step 2: Check if payment is acceptable
+                required_usd = payment_req.amount_usd
+                logger.info(f"x402: Service requires ${required_usd} USDC")
+                
+                if required_usd > max_payment:
+                    hire.status = "rejected"
+                    hire.error = f"Service requires ${required_usd}, max is ${max_payment}"
+                    logger.warning(hire.error)
+                    self._record_hire(hire)
+                    return hire
+                
+                # A service that hands the same nonce to concurrent requests
+                # gets one payment; duplicates share its result
+                key = (service_url, payment_req.nonce)
+                pending = self._inflight.get(key)
+                if pending is not None:
+                    logger.info(f"x402: Payment {payment_req.nonce[:10]} already in flight, sharing result")
+                    hire.result = await asyncio.shield(pending)
+                    hire.status = "completed"
+                    hire.actual_payment = _ZERO
+                    hire.completed_at = datetime.now()
+                    self._record_hire(hire)
+                    return hire
+                
+                # Step 3: Sign the payment
+                if payment_req.valid_until <= time.time():
+                    hire.status = "failed"
+                    hire.error = "Payment requirement expired"
+                    logger.warning(f"x402: {hire.error} for {service_url}")
+                    self._record_hire(hire)
+                    return hire
+                
+                hire.status = "paying"
+                payment_header = self._sign_payment(payment_req)
+                
+                if not payment_header:
+                    hire.status = "failed"
+                    hire.error = "Failed to sign payment - check WALLET_PRIVATE_KEY"
+                    self._record_hire(hire)
+                    return hire
+                
+                # Step 4: Make the paid request
+                logger.info(f"x402: Sending payment authorization to {service_url}")
+                paid = asyncio.ensure_future(self._make_paid_request(
+                    service_url, task, parameters, payment_header
+                ))
+                self._inflight[key] = paid
+                try:
+                    result = await paid
+                finally:
+                    self._inflight.pop(key, None)
+                
+                # Success!
+                hire.status = "completed"
+                hire.actual_payment = required_usd
+                hire.result = result
+                hire.completed_at = datetime.now()
+                
+                # Update daily tracking
+                self.daily_hires += 1
+                self.daily_spend += required_usd
+                
+                logger.info(f"x402: Hire {hire.id} completed, paid ${required_usd}")
+                
+            except Exception as e:
+                hire.status = "failed"
+                hire.error = str(e)
+                logger.error(f"x402 hire failed: {e}")
+            finally:
+                self._hires_in_progress -= 1
             
-        except Exception as e:
-            hire.status = "failed"
-            hire.error = str(e)
-            logger.error(f"x402 hire failed: {e}")
-        
-        self._record_hire(hire)
-        return hire
+            self._record_hire(hire)
+            return hire
     
     def _validate_hire(self, hire: AgentHire, trust_override: bool) -> None:
-        """Validate hire request against limits"""
+        """Validate hire request against limits (cheapest checks first)"""
         if not self.enabled:
             raise ValueError("x402 is disabled in configuration")
         
-        if not self.account:
-            raise ValueError(
-                "No signing key available. Set WALLET_PRIVATE_KEY environment variable."
-            )
-        
-        self._check_daily_reset()
-        
         if hire.max_payment > self.max_hire:
             raise ValueError(
                 f"Max payment ${hire.max_payment} exceeds limit ${self.max_hire}"
             )
         
+        # Fallback for when the reset timer isn't armed (or was cancelled)
+        self._check_daily_reset()
         if self.daily_hires >= self.max_daily:
             raise ValueError(f"Daily hire limit reached ({self.max_daily})")
         
+        if not self.account:
+            raise ValueError(
+                "No signing key available. Set WALLET_PRIVATE_KEY environment variable."
+            )
+        
         if not trust_override and self.trusted_services:
             # Check if URL is in whitelist
-            if not any(hire.service_url.startswith(t) for t in self.trusted_services):
+            if not hire.service_url.startswith(self._trusted_prefixes):
                 raise ValueError(
                     f"Service not in trusted list: {hire.service_url}. "
                     "Add to x402.trusted_services or use trust_override=True"
@@ -362,11 +533,7 @@ class X402Client:
             "parameters": parameters or {},
         }
         
-        async with self.session.post(
-            url,
-            json=payload,
-            headers={"Accept": "application/json"},
-        ) as response:
+        async with self.session.post(url, json=payload) as response:
             
             if response.status == 200:
                 # No payment required
@@ -380,7 +547,7 @@ class X402Client:
                     return PaymentRequirement.from_header(header)
                 
                 # Fall back to body
-                body = await response.json()
+                body = orjson.loads(await response.read())
                 return PaymentRequirement.from_json(body)
             
             # Other error
@@ -396,25 +563,20 @@ class X402Client:
         if not self.account:
             return None
         
-        # Build EIP-712 typed data
-        typed_data = {
-            "types": X402_TYPES,
-            "primaryType": "PaymentAuthorization",
-            "domain": X402_DOMAIN,
-            "message": {
-                "recipient": payment_req.recipient,
-                "amount": payment_req.amount,
-                "token": payment_req.token,
-                "validAfter": int(time.time()) - 60,  # Valid from 1 min ago
-                "validBefore": payment_req.valid_until,
-                "nonce": bytes.fromhex(payment_req.nonce.replace("0x", "")),
-            },
-        }
+        valid_after = int(time.time()) - 60  # Valid from 1 min ago
         
         try:
-            # Sign using eth_account's EIP-712 support
-            signable = encode_typed_data(full_message=typed_data)
-            signed = self.account.sign_message(signable)
+            # Sign the EIP-712 digest directly; the domain separator and
+            # type hash are constants computed once
+            digest = payment_authorization_digest(
+                recipient=payment_req.recipient,
+                amount=payment_req.amount,
+                token=payment_req.token,
+                valid_after=valid_after,
+                valid_before=payment_req.valid_until,
+                nonce=payment_req._nonce_bytes,
+            )
+            signed = self.account.unsafe_sign_hash(digest)
             
             # Build payment header
             payment_payload = {
@@ -427,7 +589,7 @@ class X402Client:
                         "to": payment_req.recipient,
                         "value": str(payment_req.amount),
                         "token": payment_req.token,
-                        "validAfter": typed_data["message"]["validAfter"],
+                        "validAfter": valid_after,
                         "validBefore": payment_req.valid_until,
                         "nonce": payment_req.nonce,
                     },
@@ -435,9 +597,7 @@ class X402Client:
             }
             
             # Base64 encode
-            return base64.b64encode(
-                json.dumps(payment_payload).encode()
-            ).decode()
+            return encode_payment_header(payment_payload)
             
         except Exception as e:
             logger.error(f"Failed to sign payment: {e}")
@@ -459,14 +619,11 @@ class X402Client:
         async with self.session.post(
             url,
             json=payload,
-            headers={
-                "Accept": "application/json",
-                "X-Payment": payment_header,
-            },
+            headers={"X-Payment": payment_header},
         ) as response:
             
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             
             if response.status == 402:
                 raise ValueError("Payment was rejected by service")
@@ -474,28 +631,52 @@ class X402Client:
             text = await response.text()
             raise ValueError(f"Paid request failed: {response.status} - {text[:200]}")
     
+    @property
+    def trusted_services(self) -> frozenset:
+        """Whitelisted service URL prefixes"""
+        return self._trusted_services
+    
+    @trusted_services.setter
+    def trusted_services(self, value) -> None:
+        self._trusted_services = frozenset(value)
+        # str.startswith takes a tuple and scans it in C
+        self._trusted_prefixes = tuple(self._trusted_services)
+    
+    @property
+    def daily_reset(self) -> datetime:
+        """Wall-clock time of the last daily reset"""
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._daily_reset_ts)
+    
+    @daily_reset.setter
+    def daily_reset(self, value: datetime) -> None:
+        self._daily_reset_ts = time.monotonic() - (datetime.now() - value).total_seconds()
+    
     def _check_daily_reset(self) -> None:
         """Reset daily counters if 24h has passed"""
-        now = datetime.now()
-        if now - self.daily_reset > timedelta(hours=24):
+        now = time.monotonic()
+        if now - self._daily_reset_ts >= 86400.0:
             self.daily_hires = 0
-            self.daily_spend = Decimal("0")
-            self.daily_reset = now
+            self.daily_spend = _ZERO
+            self._daily_reset_ts = now
+    
+    def _schedule_daily_reset(self) -> None:
+        """Arm a timer for the next 24h boundary"""
+        delay = max(0.0, self._daily_reset_ts + 86400.0 - time.monotonic())
+        self._reset_handle = asyncio.get_running_loop().call_later(delay, self._reset_daily)
+    
+    def _reset_daily(self) -> None:
+        """Timer callback: zero the daily counters and re-arm"""
+        self._check_daily_reset()
+        self._schedule_daily_reset()
     
     def _record_hire(self, hire: AgentHire) -> None:
         """Record hire in history"""
         self.hires.append(hire)
-        # Keep last 1000
-        if len(self.hires) > 1000:
-            self.hires = self.hires[-1000:]
     
     def get_hire_history(self, limit: int = 50) -> List[AgentHire]:
         """Get recent hire history"""
-        return sorted(
-            self.hires,
-            key=lambda h: h.created_at,
-            reverse=True
-        )[:limit]
+        # Most recently recorded first
+        return list(islice(reversed(self.hires), limit))
     
     def get_daily_stats(self) -> Dict[str, Any]:
         """Get daily usage statistics"""
@@ -0,0 +1,41 @@
+"""
+QualiaIA x402 Nonces
+
+32-byte payment nonces served from a pre-filled entropy buffer, so one
+getrandom() call covers many 402 responses.
+"""
+
+import os
+
+NONCE_BYTES = 32
+
+
+class NonceBuffer:
+    """Hands out hex nonces from a batch of OS randomness"""
+    
+    def __init__(self, batch: int = 1024):
+        self._size = NONCE_BYTES * batch
+        self._buf = b""
+        self._pos = 0
+        self._pid = 0
+    
+    def next(self) -> str:
+        """Get a fresh 32-byte nonce as hex"""
+        # Refill when exhausted, and after a fork so child processes
+        # never reuse the parent's bytes
+        if self._pos >= len(self._buf) or self._pid != os.getpid():
+            self._buf = os.urandom(self._size)
+            self._pos = 0
+            self._pid = os.getpid()
+        
+        start = self._pos
+        self._pos += NONCE_BYTES
+        return self._buf[start:self._pos].hex()
+
+
+_nonces = NonceBuffer()
+
+
+def new_nonce() -> str:
+    """Get a fresh 32-byte payment nonce as hex"""
+    return _nonces.next()
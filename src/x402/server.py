@@ -9,28 +9,35 @@ as paid API endpoints to other autonomous agents.
 """
 
 import asyncio
-import base64
-import json
+from collections import deque
+import heapq
 import os
+import threading
 import time
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 import logging
 import uuid
 
+import orjson
 from fastapi import FastAPI, Request, Response, HTTPException
 from pydantic import BaseModel
 
 from ..config import get_config
+from .client import decode_payment_header, encode_payment_header, payment_authorization_digest
+from .nonce import new_nonce
 
 logger = logging.getLogger(__name__)
 
-# Try to import web3 for signature verification
+# Try to import eth_account/eth_keys for signature verification
+# (eth_keys uses the libsecp256k1 backend when coincurve is installed)
 try:
-    from eth_account.messages import encode_typed_data
     from eth_account import Account
+    from eth_keys import keys as eth_keys
     VERIFICATION_AVAILABLE = True
 except ImportError:
     VERIFICATION_AVAILABLE = False
@@ -40,8 +47,32 @@ except ImportError:
 # USDC on Base
 USDC_BASE = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
 
+# USDC has 6 decimals
+_USDC_SCALE = Decimal(1_000_000)
+_ZERO = Decimal("0")
 
-@dataclass
+# Upper bound on an X-Payment header (base64); real ones are well under 1KB
+MAX_PAYMENT_HEADER_LEN = 8192
+
+# Longest accepted authorization window (seconds); also bounds how long
+# used nonces are remembered
+MAX_AUTHORIZATION_TTL = 900
+
+
+def _address_bytes(address: str) -> Optional[bytes]:
+    """20-byte form of a 0x-prefixed hex address (None if malformed)"""
+    if len(address) != 42 or address[:2] not in ("0x", "0X"):
+        return None
+    try:
+        return bytes.fromhex(address[2:])
+    except ValueError:
+        return None
+
+
+_USDC_BASE_BYTES = _address_bytes(USDC_BASE)
+
+
+@dataclass(slots=True)
 class ServiceDefinition:
     """Definition of an x402-enabled service"""
     name: str
@@ -50,28 +81,65 @@ class ServiceDefinition:
     price_usd: Decimal
     handler: Callable
     requires_auth: bool = True
+    # Price in USDC smallest unit, fixed at registration
+    price_units: int = field(init=False, repr=False)
+    # Whether handler must be awaited, decided once
+    is_async: bool = field(init=False, repr=False)
+    # Constant part of the 402 payment info (set by register_service)
+    payment_template: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Serialized form (definitions don't change after registration)
+    _cached_dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def __post_init__(self):
+        self.price_units = int(self.price_usd * _USDC_SCALE)
+        self.is_async = asyncio.iscoroutinefunction(self.handler)
+        self._cached_dict = {
             "name": self.name,
             "endpoint": self.endpoint,
             "description": self.description,
             "price_usd": float(self.price_usd),
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return self._cached_dict
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentRecord:
     """Record of received payment"""
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     service: str = ""
     payer: str = ""
-    amount_usd: Decimal = Decimal("0")
+    amount_usd: Decimal = _ZERO
     signature: str = ""
     status: str = "pending"  # pending, verified, executed, failed
     task: Optional[str] = None
     result: Optional[Any] = None
     created_at: datetime = field(default_factory=datetime.now)
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    # Serialized form, built once the record is final (see _record_payment)
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # created_at never changes after construction
+        self._created_at_iso = self.created_at.isoformat()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        if self._cached_dict is not None:
+            return self._cached_dict
+        return {
+            "id": self.id,
+            "service": self.service,
+            "payer": self.payer,
+            "amount_usd": float(self.amount_usd),
+            "status": self.status,
+            "created_at": self._created_at_iso,
+        }
+    
+    def freeze(self) -> None:
+        """Cache the serialized form (call once the record no longer changes)"""
+        self._cached_dict = None
+        self._cached_dict = self.to_dict()
 
 
 class PaymentRequest(BaseModel):
@@ -125,13 +193,33 @@ class X402Server:
         # Service registry
         self.services: Dict[str, ServiceDefinition] = {}
         
-        # Payment records
-        self.payments: List[PaymentRecord] = []
+        # Router built by get_router (rebuilt after new registrations)
+        self._router = None
+        
+        # Payment records (last 10000)
+        self.payments: Deque[PaymentRecord] = deque(maxlen=10000)
         
         # Revenue tracking
-        self.total_revenue = Decimal("0")
-        self.daily_revenue = Decimal("0")
-        self.daily_reset = datetime.now()
+        self.total_revenue = _ZERO
+        self.daily_revenue = _ZERO
+        self._daily_reset_ts = time.monotonic()
+        self._reset_handle: Optional[asyncio.TimerHandle] = None
+        
+        # Accepted (payer, nonce) pairs until their authorization expires,
+        # with a min-heap of expiry times for pruning
+        self._used_nonces: Dict[Tuple[bytes, bytes], int] = {}
+        self._used_nonce_expiry: List[Tuple[int, Tuple[bytes, bytes]]] = []
+    
+    @property
+    def recipient_address(self) -> str:
+        """Address payments must be made out to"""
+        return self._recipient_address
+    
+    @recipient_address.setter
+    def recipient_address(self, address: str) -> None:
+        self._recipient_address = address
+        # Byte form, so verification is case-insensitive without lower()
+        self._recipient_bytes = _address_bytes(address)
     
     def register_service(
         self,
@@ -151,11 +239,23 @@ class X402Server:
             handler=handler,
             requires_auth=requires_auth,
         )
+        service.payment_template = {
+            "recipient": self.recipient_address,
+            "amount": service.price_units,
+            "token": USDC_BASE,
+            "network": "base",
+            "description": service.description,
+            "service": service.name,
+        }
         self.services[endpoint] = service
+        self._router = None
         logger.info(f"Registered x402 service: {name} at {endpoint} (${price_usd})")
     
     def get_router(self) -> FastAPI:
         """Get FastAPI router with x402 endpoints"""
+        if self._router is not None:
+            return self._router
+        
         from fastapi import APIRouter
         router = APIRouter(prefix="/x402", tags=["x402"])
         
@@ -184,6 +284,7 @@ class X402Server:
         for endpoint, service in self.services.items():
             self._create_service_endpoint(router, service)
         
+        self._router = router
         return router
     
     def _create_service_endpoint(self, router, service: ServiceDefinition):
@@ -220,7 +321,7 @@ class X402Server:
         
         # Execute service
         try:
-            if asyncio.iscoroutinefunction(service.handler):
+            if service.is_async:
                 result = await service.handler(body.task, body.parameters or {})
             else:
                 result = service.handler(body.task, body.parameters or {})
@@ -239,35 +340,24 @@ class X402Server:
     
     def _create_402_response(self, service: ServiceDefinition) -> Response:
         """Create HTTP 402 response with payment requirements"""
-        # Amount in USDC smallest unit (6 decimals)
-        amount = int(service.price_usd * 10**6)
-        
+        # Only the validity window and nonce differ between responses
         payment_info = {
-            "recipient": self.recipient_address,
-            "amount": amount,
-            "token": USDC_BASE,
-            "network": "base",
+            **service.payment_template,
             "validUntil": int(time.time()) + 300,  # 5 minutes
-            "nonce": os.urandom(32).hex(),
-            "description": service.description,
-            "service": service.name,
+            "nonce": new_nonce(),
         }
         
         # Base64 encode for header
-        header_value = base64.b64encode(
-            json.dumps(payment_info).encode()
-        ).decode()
+        header_value = encode_payment_header(payment_info)
         
         return Response(
             status_code=402,
-            content=json.dumps({
+            content=orjson.dumps({
                 "error": "Payment Required",
                 "payment": payment_info,
             }),
-            headers={
-                "X-Payment-Required": header_value,
-                "Content-Type": "application/json",
-            },
+            media_type="application/json",
+            headers={"X-Payment-Required": header_value},
         )
     
     def _verify_payment(
@@ -285,52 +375,89 @@ class X402Server:
         4. Check the payer has sufficient balance (via RPC)
         5. Submit the transfer transaction
         
-        For now, we do signature verification only.
+        For now, steps 1-3 only.
         """
+        # Cheapest rejections first: oversized or malformed headers never
+        # reach the field checks
+        if len(payment_header) > MAX_PAYMENT_HEADER_LEN:
+            logger.warning("Payment header too large")
+            return None
+        
         try:
-            # Decode header
-            payload = json.loads(base64.b64decode(payment_header))
+            payload = decode_payment_header(payment_header, strict=True)
+            inner = payload["payload"]
+            signature = inner["signature"]
+            authorization = inner["authorization"]
+            to = _address_bytes(authorization["to"])
+            payer = _address_bytes(authorization["from"])
+            token = authorization["token"]
+            nonce = bytes.fromhex(authorization["nonce"].replace("0x", ""))
+            paid_amount = int(authorization["value"])
+            valid_after = int(authorization.get("validAfter", 0))
+            valid_before = int(authorization["validBefore"])
+            sig_bytes = bytes.fromhex(signature.replace("0x", ""))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Invalid payment structure: {e}")
+            return None
+        
+        try:
+            if payer is None or len(sig_bytes) != 65:
+                logger.warning("Invalid payment structure")
+                return None
             
-            signature = payload.get("payload", {}).get("signature")
-            authorization = payload.get("payload", {}).get("authorization", {})
+            # Verify timing
+            now = int(time.time())
+            if now < valid_after or now > valid_before:
+                logger.warning("Payment outside validity window")
+                return None
             
-            if not signature or not authorization:
-                logger.warning("Invalid payment structure")
+            if valid_before > now + MAX_AUTHORIZATION_TTL:
+                logger.warning("Payment authorization window too long")
                 return None
             
             # Verify recipient matches
-            if authorization.get("to", "").lower() != self.recipient_address.lower():
+            if to is None or to != self._recipient_bytes:
                 logger.warning("Payment recipient mismatch")
                 return None
             
-            # Verify amount is sufficient
-            required_amount = int(service.price_usd * 10**6)
-            paid_amount = int(authorization.get("value", 0))
+            # Only USDC on Base is accepted
+            if _address_bytes(token) != _USDC_BASE_BYTES:
+                logger.warning(f"Payment token not accepted: {token}")
+                return None
             
+            # Verify amount is sufficient
+            required_amount = service.price_units
             if paid_amount < required_amount:
                 logger.warning(f"Insufficient payment: {paid_amount} < {required_amount}")
                 return None
             
-            # Verify timing
-            now = int(time.time())
-            valid_after = int(authorization.get("validAfter", 0))
-            valid_before = int(authorization.get("validBefore", 0))
+            # Each authorization pays for one call
+            self._prune_used_nonces(now)
+            key = (payer, nonce)
+            if key in self._used_nonces:
+                logger.warning("Payment nonce already used")
+                return None
             
-            if now < valid_after or now > valid_before:
-                logger.warning("Payment outside validity window")
+            # Verify the payer signed exactly this authorization
+            if self._recover_signer(
+                to, paid_amount, token, valid_after, valid_before, nonce, sig_bytes
+            ) != payer:
+                logger.warning("Payment signature does not match payer")
                 return None
             
+            self._used_nonces[key] = valid_before
+            heapq.heappush(self._used_nonce_expiry, (valid_before, key))
+            
             # TODO: In production, also:
-            # 1. Recover signer address from signature
-            # 2. Check signer's USDC balance via RPC
-            # 3. Submit the actual transfer transaction
-            # 4. Wait for confirmation
+            # 1. Check signer's USDC balance via RPC
+            # 2. Submit the actual transfer transaction
+            # 3. Wait for confirmation
             
             # Create payment record
             payment = PaymentRecord(
                 service=service.name,
-                payer=authorization.get("from", "unknown"),
-                amount_usd=Decimal(paid_amount) / Decimal(10**6),
+                payer=authorization["from"],
+                amount_usd=Decimal(paid_amount) / _USDC_SCALE,
                 signature=signature,
                 status="verified",
             )
@@ -342,76 +469,120 @@ class X402Server:
             logger.error(f"Payment verification failed: {e}")
             return None
     
+    def _prune_used_nonces(self, now: int) -> None:
+        """Forget nonces whose authorization has expired"""
+        expiry = self._used_nonce_expiry
+        while expiry and expiry[0][0] < now:
+            _, key = heapq.heappop(expiry)
+            self._used_nonces.pop(key, None)
+    
+    @staticmethod
+    def _recover_signer(
+        recipient: bytes,
+        amount: int,
+        token: str,
+        valid_after: int,
+        valid_before: int,
+        nonce: bytes,
+        signature: bytes,
+    ) -> Optional[bytes]:
+        """Recover the 20-byte address that signed a PaymentAuthorization"""
+        if not VERIFICATION_AVAILABLE:
+            logger.warning("eth_account not available - cannot verify payment signatures")
+            return None
+        
+        digest = payment_authorization_digest(
+            recipient="0x" + recipient.hex(),
+            amount=amount,
+            token=token,
+            valid_after=valid_after,
+            valid_before=valid_before,
+            nonce=nonce,
+        )
+        # eth_keys expects v as 0/1 rather than 27/28
+        v = signature[64] - 27 if signature[64] >= 27 else signature[64]
+        sig = eth_keys.Signature(signature_bytes=signature[:64] + bytes([v]))
+        return sig.recover_public_key_from_msg_hash(digest).to_canonical_address()
+    
     def _record_payment(self, payment: PaymentRecord) -> None:
         """Record payment and update revenue"""
+        payment.freeze()
         self.payments.append(payment)
         
         if payment.status == "executed":
-            self._check_daily_reset()
+            self._ensure_reset_timer()
             self.total_revenue += payment.amount_usd
             self.daily_revenue += payment.amount_usd
-        
-        # Keep last 10000 records
-        if len(self.payments) > 10000:
-            self.payments = self.payments[-10000:]
+    
+    @property
+    def daily_reset(self) -> datetime:
+        """Wall-clock time of the last daily reset"""
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._daily_reset_ts)
+    
+    @daily_reset.setter
+    def daily_reset(self, value: datetime) -> None:
+        self._daily_reset_ts = time.monotonic() - (datetime.now() - value).total_seconds()
     
     def _check_daily_reset(self) -> None:
         """Reset daily counters"""
-        from datetime import timedelta
-        now = datetime.now()
-        if now - self.daily_reset > timedelta(hours=24):
-            self.daily_revenue = Decimal("0")
-            self.daily_reset = now
+        now = time.monotonic()
+        if now - self._daily_reset_ts >= 86400.0:
+            self.daily_revenue = _ZERO
+            self._daily_reset_ts = now
+    
+    def _schedule_daily_reset(self) -> None:
+        """Arm a timer for the next 24h boundary"""
+        delay = max(0.0, self._daily_reset_ts + 86400.0 - time.monotonic())
+        self._reset_handle = asyncio.get_running_loop().call_later(delay, self._reset_daily)
+    
+    def _reset_daily(self) -> None:
+        """Timer callback: zero daily revenue and re-arm"""
+        self._check_daily_reset()
+        self._schedule_daily_reset()
+    
+    def _ensure_reset_timer(self) -> None:
+        """Arm the daily reset timer on first revenue"""
+        if self._reset_handle is not None:
+            return
+        try:
+            self._schedule_daily_reset()
+        except RuntimeError:
+            # No running loop (sync caller) - check inline instead
+            self._check_daily_reset()
+    
+    async def close(self) -> None:
+        """Cancel the daily reset timer"""
+        if self._reset_handle:
+            self._reset_handle.cancel()
+            self._reset_handle = None
     
     def get_payment_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent payment history"""
-        return [
-            {
-                "id": p.id,
-                "service": p.service,
-                "payer": p.payer,
-                "amount_usd": float(p.amount_usd),
-                "status": p.status,
-                "created_at": p.created_at.isoformat(),
-            }
-            for p in sorted(
-                self.payments,
-                key=lambda x: x.created_at,
-                reverse=True
-            )[:limit]
-        ]
+        # Appended in creation order, so the tail is already the most recent
+        return [p.to_dict() for p in islice(reversed(self.payments), limit)]
 
 
 # =============================================================================
 # Example Service Handlers
 # =============================================================================
 
-async def market_analysis_handler(task: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Example handler for market analysis service.
-    
-    TODO: Implement actual market analysis logic.
-    This would typically call the MarketScanner agent.
-    """
-    return {
-        "task": task,
-        "analysis": "Market analysis results would go here",
-        "params_received": params,
-        "note": "TODO: Implement actual analysis via MarketScanner agent"
-    }
-
-
-async def code_review_handler(task: str, params: Dict[str, Any]) -> Dict[str, Any]:
+async def _stub_handler(
+    result_key: str,
+    summary: str,
+    note: str,
+    task: str,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
     """
-    Example handler for code review service.
+    Placeholder handler shared by the example services.
     
-    TODO: Implement actual code review logic.
+    TODO: Replace with real handlers (MarketScanner, OperatorAgent).
     """
     return {
         "task": task,
-        "review": "Code review results would go here",
+        result_key: summary,
         "params_received": params,
-        "note": "TODO: Implement actual code review via OperatorAgent"
+        "note": note,
     }
 
 
@@ -419,27 +590,53 @@ async def code_review_handler(task: str, params: Dict[str, Any]) -> Dict[str, An
 # Factory
 # =============================================================================
 
-def create_x402_server() -> X402Server:
-    """Create and configure x402 server with default services"""
-    server = X402Server()
-    
-    # Register example services
-    # TODO: Add real QualiaIA service handlers
-    
-    server.register_service(
-        name="market_analysis",
-        endpoint="/x402/market-analysis",
-        price_usd=Decimal("5.00"),
-        handler=market_analysis_handler,
-        description="AI-powered market opportunity analysis",
-    )
-    
-    server.register_service(
-        name="code_review",
-        endpoint="/x402/code-review",
-        price_usd=Decimal("2.50"),
-        handler=code_review_handler,
-        description="Automated code review and suggestions",
-    )
+# Shared server. Creation holds a lock so a factory call from a worker
+# thread (e.g. a sync FastAPI dependency) can't race the event loop into
+# building two servers; reads after that are lock-free.
+_server: Optional[X402Server] = None
+_server_lock = threading.Lock()
+
+
+def create_x402_server(fresh: bool = False) -> X402Server:
+    """Get x402 server with default services (shared unless fresh=True)"""
+    global _server
+    if _server is not None and not fresh:
+        return _server
     
-    return server
+    with _server_lock:
+        if _server is not None and not fresh:
+            return _server
+        
+        server = X402Server()
+        
+        # Register example services
+        # TODO: Add real QualiaIA service handlers
+        
+        server.register_service(
+            name="market_analysis",
+            endpoint="/x402/market-analysis",
+            price_usd=Decimal("5.00"),
+            handler=partial(
+                _stub_handler,
+                "analysis",
+                "Market analysis results would go here",
+                "TODO: Implement actual analysis via MarketScanner agent",
+            ),
+            description="AI-powered market opportunity analysis",
+        )
+        
+        server.register_service(
+            name="code_review",
+            endpoint="/x402/code-review",
+            price_usd=Decimal("2.50"),
+            handler=partial(
+                _stub_handler,
+                "review",
+                "Code review results would go here",
+                "TODO: Implement actual code review via OperatorAgent",
+            ),
+            description="Automated code review and suggestions",
+        )
+        
+        _server = server
+        return server
@@ -4,23 +4,42 @@ QualiaIA Test Configuration
 Pytest fixtures and configuration.
 """
 
-import asyncio
-import os
+from itertools import cycle
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
-# Set test environment
-os.environ["ENVIRONMENT"] = "test"
-os.environ["OPENROUTER_API_KEY"] = "test-key-for-mocking"
-os.environ["TELEGRAM_BOT_TOKEN"] = "123456:ABC-TEST"
-os.environ["TELEGRAM_AUTHORIZED_USER_IDS"] = "123456789"
+
+@pytest.fixture(scope="session", autouse=True)
+def _test_env():
+    """Set test environment for the session"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ENVIRONMENT", "test")
+        mp.setenv("OPENROUTER_API_KEY", "test-key-for-mocking")
+        mp.setenv("TELEGRAM_BOT_TOKEN", "123456:ABC-TEST")
+        mp.setenv("TELEGRAM_AUTHORIZED_USER_IDS", "123456789")
+        yield
+
+
+# Canned council opinions, served round-robin by patched_openrouter
+CANNED_OPINIONS = [
+    '{"vote": "approve", "confidence": 0.85, "reasoning": "Test reasoning"}',
+    '{"vote": "approve", "confidence": 0.7, "reasoning": "Acceptable risk"}',
+    '{"vote": "reject", "confidence": 0.6, "reasoning": "Unclear demand"}',
+]
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def patched_openrouter():
+    """Patch the OpenRouter client for the session with canned completions"""
+    responses = cycle([
+        SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        for content in CANNED_OPINIONS
+    ])
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: next(responses))
+    with patch("src.council.deliberation.openai.AsyncOpenAI", return_value=client):
+        yield client
 
 
 @pytest.fixture
@@ -0,0 +1,167 @@
+"""
+Tests for QualiaIA Compliance Manager
+
+Config is mocked; covers consent bookkeeping and the check cache.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.legal.compliance import (
+    ComplianceManager,
+    ConsentRecord,
+    DataCategory,
+    DataProcessingRecord,
+    Jurisdiction,
+)
+
+
+@pytest.fixture
+def manager():
+    with patch("src.legal.compliance.get_config", return_value=SimpleNamespace(compliance=MagicMock())):
+        return ComplianceManager()
+
+
+def _consent(user_id, expires_in=None, granted=True, purpose="marketing"):
+    return ConsentRecord(
+        user_id=user_id,
+        purpose=purpose,
+        granted=granted,
+        expires_at=datetime.now() + expires_in if expires_in is not None else None,
+    )
+
+
+class TestProcessingRecords:
+    def test_created_at_is_a_field(self):
+        created = datetime(2026, 1, 2, 3, 4, 5)
+        record = DataProcessingRecord(
+            id="proc_1",
+            purpose="billing",
+            legal_basis="contract",
+            data_categories=[DataCategory.FINANCIAL],
+            retention_days=2555,
+            recipients=[],
+            created_at=created,
+        )
+        
+        assert record.to_dict()["created_at"] == created.isoformat()
+        record.created_at = datetime(2026, 2, 1)
+        assert record.to_dict()["created_at"] == "2026-02-01T00:00:00"
+
+
+class TestConsents:
+    def test_only_valid_consents_counted(self, manager):
+        manager.add_consent("a", _consent("a"))
+        manager.add_consent("b", _consent("b", granted=False))
+        manager.add_consent("c", _consent("c", expires_in=timedelta(seconds=-1)))
+        
+        assert manager._active_consent_count == 1
+        assert manager._consent_expiry_heap == []
+    
+    def test_sweep_expires_in_order(self, manager):
+        soon = _consent("a", expires_in=timedelta(hours=1))
+        later = _consent("b", expires_in=timedelta(days=2))
+        manager.add_consent("a", soon)
+        manager.add_consent("b", later)
+        manager.add_consent("c", _consent("c"))
+        
+        assert manager.sweep_expired_consents() == 0
+        assert manager.sweep_expired_consents(datetime.now() + timedelta(days=1)) == 1
+        assert soon.expired and not later.expired
+        assert manager._active_consent_count == 2
+        
+        assert manager.sweep_expired_consents(datetime.now() + timedelta(days=3)) == 1
+        assert manager._active_consent_count == 1
+    
+    def test_reconsent_replaces_previous_record(self, manager):
+        first = _consent("a", expires_in=timedelta(hours=1))
+        second = _consent("a", expires_in=timedelta(days=2))
+        manager.add_consent("a", first)
+        manager.add_consent("a", second)
+        
+        assert manager._active_consent_count == 1
+        assert not first.is_valid()
+        
+        # The first record's heap entry must not uncount the second
+        assert manager.sweep_expired_consents(datetime.now() + timedelta(days=1)) == 0
+        assert manager._active_consent_count == 1
+        assert second.is_valid()
+        
+        assert manager.sweep_expired_consents(datetime.now() + timedelta(days=3)) == 1
+        assert manager._active_consent_count == 0
+    
+    def test_withdrawal_uncounts_consent(self, manager):
+        manager.add_consent("a", _consent("a"))
+        manager.add_consent("a", _consent("a", purpose="analytics"))
+        manager.add_consent("a", _consent("a", granted=False))
+        
+        assert manager._active_consent_count == 1
+
+
+def _compliance_config(rgpd_compliant=True):
+    return SimpleNamespace(
+        france=SimpleNamespace(
+            rgpd_compliant=rgpd_compliant,
+            dpia_required=False,
+            cnil_registration="CNIL-1",
+            dpo_email="dpo@example.com",
+            data_retention_days=365,
+        ),
+        usa=SimpleNamespace(
+            ccpa_compliant=True,
+            privacy_policy_url="https://example.com/privacy",
+            colorado_ai_act=True,
+        ),
+        eu_ai_act=SimpleNamespace(
+            risk_classification="limited",
+            transparency_enabled=True,
+            human_oversight_enabled=True,
+        ),
+    )
+
+
+class TestCheckCache:
+    def test_cached_result_is_shared_and_read_only(self, manager):
+        manager.config = _compliance_config()
+        first = manager.check_compliance(Jurisdiction.FRANCE)
+        
+        assert manager.check_compliance(Jurisdiction.FRANCE) is first
+        assert first["compliant"]
+        with pytest.raises(TypeError):
+            first["compliant"] = False
+        with pytest.raises(TypeError):
+            first["checks"]["rgpd_compliant"] = False
+    
+    def test_config_changes_invalidate(self, manager):
+        manager.config = _compliance_config()
+        assert manager.check_compliance(Jurisdiction.FRANCE)["compliant"]
+        
+        manager.config = _compliance_config(rgpd_compliant=False)
+        assert not manager.check_compliance(Jurisdiction.FRANCE)["compliant"]
+        
+        # In-place edits need an explicit invalidation
+        manager.config.france.rgpd_compliant = True
+        assert not manager.check_compliance(Jurisdiction.FRANCE)["compliant"]
+        manager.invalidate_checks()
+        assert manager.check_compliance(Jurisdiction.FRANCE)["compliant"]
+    
+    def test_processing_records_keep_cache(self, manager):
+        manager.config = _compliance_config()
+        first = manager.check_compliance(Jurisdiction.FRANCE)
+        
+        manager.record_processing("billing", "contract", [DataCategory.TECHNICAL])
+        assert manager.check_compliance(Jurisdiction.FRANCE) is first
+    
+    def test_report_reuses_jurisdictions(self, manager):
+        manager.config = _compliance_config()
+        with patch.object(manager, "check_compliance", wraps=manager.check_compliance) as check:
+            first = manager.generate_compliance_report()
+            second = manager.generate_compliance_report()
+            assert second["jurisdictions"] is first["jurisdictions"]
+            assert check.call_count == 4
+            
+            manager.invalidate_checks()
+            manager.generate_compliance_report()
+            assert check.call_count == 8
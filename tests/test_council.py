@@ -1,11 +1,13 @@
 """
 Tests for QualiaIA Council Deliberation
 
-NOTE: These tests require mocking OpenRouter API calls.
+OpenRouter calls are served by the patched_openrouter fixture (conftest).
 """
 
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 from src.council.deliberation import (
     CouncilDeliberation,
@@ -15,20 +17,6 @@ from src.council.deliberation import (
 )
 
 
-@pytest.fixture
-def mock_openai_response():
-    """Mock OpenAI/OpenRouter response"""
-    mock_response = MagicMock()
-    mock_response.choices = [
-        MagicMock(
-            message=MagicMock(
-                content='{"vote": "approve", "confidence": 0.85, "reasoning": "Test reasoning"}'
-            )
-        )
-    ]
-    return mock_response
-
-
 class TestCouncilMember:
     def test_creation(self):
         member = CouncilMember(
@@ -75,3 +63,70 @@ class TestDeliberationResult:
         assert d["consensus"] is True
         assert d["vote"] == "approve"
         assert d["confidence"] == 0.85
+
+
+@pytest.mark.usefixtures("patched_openrouter")
+class TestCouncilDeliberation:
+    @pytest.fixture
+    def council(self):
+        return CouncilDeliberation()
+    
+    @pytest.mark.asyncio
+    async def test_result_cache(self, council):
+        create = council.client.chat.completions.create
+        
+        first = await council.deliberate("Launch venture?", {"amount": 500})
+        calls = create.await_count
+        second = await council.deliberate("Launch venture?", {"amount": 500})
+        
+        assert second is not first
+        assert second.vote == first.vote
+        assert create.await_count == calls
+        
+        # Changing a returned result doesn't leak into later hits
+        second.opinions.clear()
+        third = await council.deliberate("Launch venture?", {"amount": 500})
+        assert third.opinions and len(third.opinions) == len(first.opinions)
+        
+        council.invalidate("Launch venture?")
+        await council.deliberate("Launch venture?", {"amount": 500})
+        
+        assert create.await_count > calls
+        
+        # Results built from API errors are not cached
+        failing = AsyncMock(side_effect=RuntimeError("OpenRouter unavailable"))
+        with patch.object(council.client.chat.completions, "create", failing):
+            await council.deliberate("Expand venture?", {"amount": 500})
+            calls = failing.await_count
+            await council.deliberate("Expand venture?", {"amount": 500})
+        
+        assert failing.await_count > calls
+    
+    def test_can_shortcircuit(self, council):
+        council.consensus_threshold = 0.66
+        a, b, c = (CouncilMember(f"m{i}", "Advisor") for i in range(3))
+        approve = lambda m: Opinion(member=m, vote="approve", confidence=1.0, reasoning="")
+        
+        # 2 of 3 approvals at full confidence settle it
+        assert council._can_shortcircuit([approve(a), approve(b)], [c])
+        # A single approval could still be outvoted
+        assert not council._can_shortcircuit([approve(a)], [b, c])
+    
+    @pytest.mark.asyncio
+    async def test_opinions_requested_concurrently(self, council):
+        in_flight = peak = 0
+        
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            content = '{"vote": "reject", "confidence": 0.5, "reasoning": "Slow"}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        
+        with patch.object(council.client.chat.completions, "create", AsyncMock(side_effect=create)):
+            opinions = await council._gather_opinions("Launch venture?", {"amount": 500})
+        
+        assert opinions
+        assert peak > 1
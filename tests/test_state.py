@@ -3,7 +3,7 @@ Tests for QualiaIA State Management
 """
 
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from src.core.state import SystemState, SystemStatus, PendingDecision
 
@@ -27,12 +27,35 @@ class TestSystemState:
         await state.update(status=SystemStatus.RUNNING)
         assert state.status == SystemStatus.RUNNING
     
+    @pytest.mark.asyncio
+    async def test_set_status(self, state):
+        seen = []
+        state.subscribe("status", lambda event, data: seen.append(data))
+        
+        await state.set_status(SystemStatus.RUNNING)
+        await state.set_status(SystemStatus.RUNNING)
+        await state.flush()
+        
+        assert state.status == SystemStatus.RUNNING
+        assert seen == [SystemStatus.RUNNING]
+    
     @pytest.mark.asyncio
     async def test_record_decision(self, state):
         await state.record_decision("autonomous")
         assert state.today.decisions_total == 1
         assert state.today.decisions_autonomous == 1
     
+    @pytest.mark.asyncio
+    async def test_check_daily_reset(self, state):
+        assert await state.check_daily_reset() is False
+        
+        await state.record_decision("autonomous")
+        state._today_ordinal -= 1
+        
+        assert await state.check_daily_reset() is True
+        assert state.today.decisions_total == 0
+        assert await state.check_daily_reset() is False
+    
     @pytest.mark.asyncio
     async def test_pending_decision(self, state):
         decision = PendingDecision(
@@ -65,6 +88,52 @@ class TestSystemState:
         assert resolved.status == "approved"
         assert resolved.responded_by == "tester"
     
+    @pytest.mark.asyncio
+    async def test_sweep_expired(self, state):
+        expired = PendingDecision(
+            id="test-003",
+            decision_type="financial",
+            action="Expired action",
+            amount=100.0,
+            reason="Test reason",
+            created_at=datetime.now() - timedelta(hours=25),
+        )
+        fresh = PendingDecision(
+            id="test-004",
+            decision_type="financial",
+            action="Fresh action",
+            amount=100.0,
+            reason="Test reason",
+        )
+        
+        await state.add_pending_decision(expired)
+        await state.add_pending_decision(fresh)
+        swept = await state.sweep_expired()
+        
+        assert [d.id for d in swept] == ["test-003"]
+        assert expired.status == "timeout"
+        assert fresh.status == "pending"
+        assert await state.sweep_expired() == []
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_unsubscribe(self, state):
+        class Listener:
+            def __init__(self):
+                self.events = []
+            
+            def on_event(self, event, data):
+                self.events.append(event)
+        
+        listener = Listener()
+        state.subscribe("status", listener.on_event)
+        await state.update(status=SystemStatus.RUNNING)
+        await state.flush()
+        state.unsubscribe("status", listener.on_event)
+        await state.update(status=SystemStatus.PAUSED)
+        await state.flush()
+        
+        assert listener.events == ["status"]
+    
     def test_to_dict(self, state):
         result = state.to_dict()
         
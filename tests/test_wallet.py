@@ -0,0 +1,210 @@
+"""
+Tests for QualiaIA Wallet Manager
+
+Web3 calls are mocked; no RPC or chain access.
+"""
+
+import asyncio
+import pytest
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from aiolimiter import AsyncLimiter
+
+from src.config import get_config
+from src.core.wallet import Transaction, WalletManager
+
+RECIPIENT = "0x1234567890123456789012345678901234567890"
+
+
+@pytest.fixture
+def wallet(tmp_path):
+    config = get_config().wallet.model_copy(
+        update={"transactions_db_path": str(tmp_path / "tx.db")}
+    )
+    wallet = WalletManager(config)
+    wallet.address = "0x" + "ab" * 20
+    wallet._usdc_checksum = "0x" + "cd" * 20
+    wallet._gas_price = 10**9
+    
+    wallet.w3 = MagicMock()
+    wallet.w3.to_checksum_address = lambda address: address
+    
+    signed_nonces = []
+    
+    def sign_transaction(tx_data):
+        signed_nonces.append(tx_data["nonce"])
+        return SimpleNamespace(raw_transaction=bytes([tx_data["nonce"]]))
+    
+    wallet.account = MagicMock()
+    wallet.account.sign_transaction = sign_transaction
+    wallet.signed_nonces = signed_nonces
+    return wallet
+
+
+class TestNonces:
+    @pytest.mark.asyncio
+    async def test_concurrent_first_sends_get_distinct_nonces(self, wallet):
+        async def transaction_count(address, block):
+            await asyncio.sleep(0.01)
+            return 7
+        
+        wallet.w3.eth.get_transaction_count = AsyncMock(side_effect=transaction_count)
+        wallet.w3.eth.send_raw_transaction = AsyncMock(side_effect=lambda raw: raw * 32)
+        
+        txs = await asyncio.gather(*(
+            wallet._execute_transaction(
+                Transaction(type="send", to_address=RECIPIENT), 1_000_000
+            )
+            for _ in range(2)
+        ))
+        
+        assert [tx.status for tx in txs] == ["submitted", "submitted"]
+        assert sorted(wallet.signed_nonces) == [7, 8]
+        assert wallet.w3.eth.get_transaction_count.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_send_resyncs_after_in_flight_sends(self, wallet):
+        wallet.w3.eth.get_transaction_count = AsyncMock(return_value=7)
+        nonce_during_send = []
+        
+        async def send_raw_transaction(raw):
+            if raw == bytes([8]):
+                raise ValueError("rejected")
+            await asyncio.sleep(0.01)
+            nonce_during_send.append(wallet._nonce)
+            return raw * 32
+        
+        wallet.w3.eth.send_raw_transaction = AsyncMock(side_effect=send_raw_transaction)
+        
+        txs = await asyncio.gather(*(
+            wallet._execute_transaction(
+                Transaction(type="send", to_address=RECIPIENT), 1_000_000
+            )
+            for _ in range(2)
+        ))
+        
+        assert sorted(tx.status for tx in txs) == ["failed", "submitted"]
+        # Not reset while nonce 7 was still being sent, resynced afterwards
+        assert nonce_during_send == [9]
+        assert wallet._nonce is None
+
+
+class TestSendLimits:
+    @pytest.mark.asyncio
+    async def test_burst_limiter_throttles_sends(self, wallet):
+        wallet.account = None  # Simulation mode
+        wallet._send_burst_limiter = AsyncLimiter(max_rate=2, time_period=1)
+        
+        sends = [
+            asyncio.ensure_future(wallet.send_payment(RECIPIENT, Decimal("1")))
+            for _ in range(3)
+        ]
+        done, pending = await asyncio.wait(sends, timeout=0.2)
+        
+        assert len(done) == 2
+        assert all(task.result().status == "simulated" for task in done)
+        for task in pending:
+            task.cancel()
+    
+    @pytest.mark.asyncio
+    async def test_rejected_sends_spend_no_tokens(self, wallet):
+        wallet.account = None
+        wallet._send_burst_limiter = AsyncLimiter(max_rate=1, time_period=1)
+        
+        for _ in range(3):
+            assert await wallet.send_payment(RECIPIENT, wallet.max_single_tx + 1) is None
+        tx = await asyncio.wait_for(wallet.send_payment(RECIPIENT, Decimal("1")), timeout=0.2)
+        
+        assert tx.status == "simulated"
+    
+    @pytest.mark.asyncio
+    async def test_daily_limit_rejects_send(self, wallet):
+        wallet.account = None
+        wallet._daily_spent_u = wallet._max_daily_u
+        
+        assert await wallet.send_payment(RECIPIENT, Decimal("1")) is None
+        assert len(wallet.transactions) == 0
+
+
+class TestReceipts:
+    def _pending(self, wallet, tx_hash, amount_u=2_000_000, age=0.0):
+        tx = Transaction(
+            type="send",
+            amount=Decimal(amount_u) / 10**6,
+            to_address=RECIPIENT,
+            status="submitted",
+            timestamp=datetime.now() - timedelta(seconds=age),
+            tx_hash=tx_hash,
+        )
+        wallet._pending_receipts[tx_hash] = (tx, amount_u, asyncio.Event())
+        wallet._daily_spent_u += amount_u
+        return tx
+    
+    @pytest.mark.asyncio
+    async def test_reconcile_settles_and_refunds(self, wallet):
+        confirmed = self._pending(wallet, "0xaa")
+        failed = self._pending(wallet, "0xbb")
+        waiting = self._pending(wallet, "0xcc")
+        abandoned = self._pending(wallet, "0xdd", age=wallet._confirm_timeout + 1)
+        
+        async def receipt(tx_hash):
+            if tx_hash in ("0xcc", "0xdd"):
+                raise LookupError("not mined")
+            return SimpleNamespace(status=1 if tx_hash == "0xaa" else 0)
+        
+        wallet.w3.eth.get_transaction_receipt = AsyncMock(side_effect=receipt)
+        await wallet._reconcile_receipts()
+        
+        assert confirmed.status == "confirmed"
+        assert failed.status == "failed"
+        assert waiting.status == "submitted"
+        assert abandoned.status == "submitted"
+        # Only the reverted transfer is refunded against the daily limit
+        assert wallet._daily_spent_u == 6_000_000
+        assert list(wallet._pending_receipts) == ["0xcc"]
+        
+        await wallet.wait_for_confirmation(failed, timeout=0.1)
+    
+    @pytest.mark.asyncio
+    async def test_settled_status_persisted(self, wallet):
+        wallet.account = None
+        wallet.transactions = deque(maxlen=1)
+        tx = self._pending(wallet, "0xaa")
+        await wallet._persist_transactions([tx])
+        
+        wallet.w3.eth.get_transaction_receipt = AsyncMock(return_value=SimpleNamespace(status=1))
+        await wallet._reconcile_receipts()
+        await wallet.send_payment(RECIPIENT, Decimal("1"))
+        
+        history = await wallet.fetch_transaction_history(limit=2)
+        assert [t.status for t in history] == ["simulated", "confirmed"]
+        assert history[1].tx_hash == "0xaa"
+
+
+class TestTransactionLog:
+    @pytest.mark.asyncio
+    async def test_log_created_on_first_write(self, tmp_path):
+        db_path = tmp_path / "logs" / "tx.db"
+        config = get_config().wallet.model_copy(
+            update={"transactions_db_path": str(db_path)}
+        )
+        wallet = WalletManager(config)
+        assert not db_path.parent.exists()
+        
+        await wallet.send_payment(RECIPIENT, Decimal("1"))
+        assert db_path.exists()
+        await wallet.close()
+    
+    @pytest.mark.asyncio
+    async def test_history_query_uses_timestamp_index(self, wallet):
+        wallet.account = None
+        await wallet.send_payment(RECIPIENT, Decimal("1"))
+        
+        plan = wallet._db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM transactions ORDER BY timestamp DESC LIMIT 5"
+        ).fetchall()
+        assert "idx_transactions_timestamp" in plan[0][-1]
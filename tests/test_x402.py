@@ -5,17 +5,23 @@ Tests for both client (hiring agents) and server (offering services).
 """
 
 import pytest
+from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch, MagicMock
+import asyncio
 import json
 import base64
 import time
 
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+
 from src.x402.client import (
     X402Client,
     AgentHire,
     PaymentRequirement,
     X402_DOMAIN,
+    X402_TYPES,
     USDC_BASE,
 )
 from src.x402.server import (
@@ -61,6 +67,18 @@ class TestPaymentRequirement:
         
         assert req.amount_usd == Decimal("2.5")
         assert req.nonce == "def456"
+    
+    def test_generated_nonce(self):
+        data = {
+            "recipient": "0x1234567890123456789012345678901234567890",
+            "amount": 1000000,
+        }
+        
+        first = PaymentRequirement.from_json(data)
+        second = PaymentRequirement.from_json(data)
+        
+        assert len(first.nonce) == 64
+        assert first.nonce != second.nonce
 
 
 class TestAgentHire:
@@ -96,7 +114,7 @@ class TestAgentHire:
 class TestX402Client:
     """Tests for X402Client"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def client(self):
         with patch.dict('os.environ', {'WALLET_PRIVATE_KEY': ''}):
             client = X402Client()
@@ -105,6 +123,18 @@ class TestX402Client:
             client.max_daily = 10
             return client
     
+    @pytest.fixture(autouse=True)
+    def _reset_client(self, client):
+        """Restore the shared client between tests"""
+        yield
+        client.enabled = True
+        client.account = None
+        client.session = None
+        client.daily_hires = 0
+        client.daily_spend = Decimal("0")
+        client.daily_reset = datetime.now()
+        client.hires.clear()
+    
     def test_daily_limit_tracking(self, client):
         client.daily_hires = 5
         stats = client.get_daily_stats()
@@ -113,8 +143,6 @@ class TestX402Client:
         assert stats["hires_limit"] == 10
     
     def test_daily_reset(self, client):
-        from datetime import datetime, timedelta
-        
         client.daily_hires = 5
         client.daily_spend = Decimal("50")
         client.daily_reset = datetime.now() - timedelta(hours=25)
@@ -124,6 +152,29 @@ class TestX402Client:
         assert client.daily_hires == 0
         assert client.daily_spend == Decimal("0")
     
+    def test_stale_day_reset_without_timer(self, client):
+        client.daily_hires = 10
+        client.daily_spend = Decimal("50")
+        client.daily_reset = datetime.now() - timedelta(hours=25)
+        
+        assert client._reset_handle is None
+        stats = client.get_daily_stats()
+        
+        assert stats["hires_today"] == 0
+        assert stats["spend_today_usd"] == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_stale_day_does_not_block_hires(self, client):
+        client.account = Account.create()
+        client.session = MagicMock()
+        client.daily_hires = 10
+        client.daily_reset = datetime.now() - timedelta(hours=25)
+        
+        with patch.object(client, "_request_service", AsyncMock(return_value=None)):
+            hire = await client.hire_agent("https://example.com", "Test", Decimal("10"))
+        
+        assert hire.status == "completed"
+    
     @pytest.mark.asyncio
     async def test_hire_validation_disabled(self, client):
         client.enabled = False
@@ -162,6 +213,115 @@ class TestX402Client:
         
         assert hire.status == "failed"
         assert "exceeds limit" in hire.error.lower()
+    
+    def test_sign_payment_matches_typed_data(self, client):
+        client.account = Account.create()
+        req = PaymentRequirement(
+            recipient="0x1234567890123456789012345678901234567890",
+            amount=5000000,
+            token=USDC_BASE,
+            network="base",
+            valid_until=int(time.time()) + 300,
+            nonce="11" * 32,
+        )
+        
+        header = json.loads(base64.b64decode(client._sign_payment(req)))
+        auth = header["payload"]["authorization"]
+        typed_data = {
+            "types": X402_TYPES,
+            "primaryType": "PaymentAuthorization",
+            "domain": X402_DOMAIN,
+            "message": {
+                "recipient": req.recipient,
+                "amount": req.amount,
+                "token": req.token,
+                "validAfter": auth["validAfter"],
+                "validBefore": auth["validBefore"],
+                "nonce": bytes.fromhex(req.nonce),
+            },
+        }
+        expected = client.account.sign_message(encode_typed_data(full_message=typed_data))
+        
+        assert header["payload"]["signature"] == expected.signature.hex()
+    
+    @pytest.mark.asyncio
+    async def test_expired_requirement_not_signed(self, client):
+        client.account = Account.create()
+        client.session = MagicMock()
+        req = PaymentRequirement(
+            recipient="0x1234567890123456789012345678901234567890",
+            amount=1000000,
+            token=USDC_BASE,
+            network="base",
+            valid_until=int(time.time()) - 1,
+            nonce="55" * 32,
+        )
+        
+        with patch.object(client, "_request_service", AsyncMock(return_value=req)), \
+             patch.object(client, "_sign_payment") as sign:
+            hire = await client.hire_agent("https://example.com", "Test", Decimal("10"))
+        
+        assert hire.status == "failed"
+        assert "expired" in hire.error
+        sign.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_queued_burst_respects_daily_limit(self, client):
+        client.account = Account.create()
+        client.session = MagicMock()
+        client.daily_hires = 8
+        nonces = iter(range(4))
+        
+        def requirement(*args):
+            return PaymentRequirement(
+                recipient="0x1234567890123456789012345678901234567890",
+                amount=1000000,
+                token=USDC_BASE,
+                network="base",
+                valid_until=int(time.time()) + 300,
+                nonce=f"{next(nonces):064x}",
+            )
+        
+        with patch.object(client, "_hire_slots", asyncio.Semaphore(1)), \
+             patch.object(client, "_request_service", AsyncMock(side_effect=requirement)), \
+             patch.object(client, "_make_paid_request", AsyncMock(return_value={"ok": True})) as paid:
+            hires = await asyncio.gather(*(
+                client.hire_agent("https://example.com", "Test", Decimal("10"))
+                for _ in range(4)
+            ))
+        
+        assert [h.status for h in hires].count("completed") == 2
+        assert paid.await_count == 2
+        assert client.daily_hires == 10
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_nonce_pays_once(self, client):
+        client.account = Account.create()
+        client.session = MagicMock()
+        req = PaymentRequirement(
+            recipient="0x1234567890123456789012345678901234567890",
+            amount=1000000,
+            token=USDC_BASE,
+            network="base",
+            valid_until=int(time.time()) + 300,
+            nonce="33" * 32,
+        )
+        
+        async def paid_request(*args):
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+        
+        with patch.object(client, "_request_service", AsyncMock(return_value=req)), \
+             patch.object(client, "_make_paid_request", AsyncMock(side_effect=paid_request)) as paid:
+            hires = await asyncio.gather(*(
+                client.hire_agent("https://example.com", "Test", Decimal("10"))
+                for _ in range(2)
+            ))
+        
+        assert [h.status for h in hires] == ["completed", "completed"]
+        assert all(h.result == {"ok": True} for h in hires)
+        assert paid.await_count == 1
+        assert client.daily_spend == Decimal("1")
 
 
 class TestServiceDefinition:
@@ -186,10 +346,50 @@ class TestServiceDefinition:
 class TestX402Server:
     """Tests for X402Server"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def server(self):
         return X402Server()
     
+    @pytest.fixture(autouse=True)
+    def _reset_server(self, server):
+        """Restore the shared server between tests"""
+        recipient = server.recipient_address
+        yield
+        server.recipient_address = recipient
+        server.services.clear()
+        server._router = None
+        server.payments.clear()
+        server.total_revenue = Decimal("0")
+        server.daily_revenue = Decimal("0")
+        server.daily_reset = datetime.now()
+        server._used_nonces.clear()
+        server._used_nonce_expiry.clear()
+    
+    def _paid_service(self, server):
+        """Register a $5 service payable to a fixed address"""
+        server.recipient_address = "0x1234567890123456789012345678901234567890"
+        server.register_service(
+            name="test",
+            endpoint="/x402/test",
+            price_usd=Decimal("5.00"),
+            handler=lambda task, params: {"result": "ok"},
+        )
+        return server.services["/x402/test"]
+    
+    def _signed_header(self, server, token=USDC_BASE, payer=None):
+        """X-Payment header signed by payer (a fresh account by default) for $5"""
+        with patch.dict('os.environ', {'WALLET_PRIVATE_KEY': ''}):
+            client = X402Client()
+        client.account = payer or Account.create()
+        return client._sign_payment(PaymentRequirement(
+            recipient=server.recipient_address,
+            amount=5000000,
+            token=token,
+            network="base",
+            valid_until=int(time.time()) + 300,
+            nonce="44" * 32,
+        ))
+    
     def test_register_service(self, server):
         server.register_service(
             name="test",
@@ -202,6 +402,34 @@ class TestX402Server:
         assert "/x402/test" in server.services
         assert server.services["/x402/test"].price_usd == Decimal("10.00")
     
+    def test_verify_payment_signature(self, server):
+        service = self._paid_service(server)
+        payer = Account.create()
+        header = self._signed_header(server, payer=payer)
+        
+        payment = server._verify_payment(header, service)
+        assert payment is not None
+        assert payment.payer == payer.address
+        
+        # Claiming a different payer must fail signature recovery
+        tampered = json.loads(base64.b64decode(header))
+        tampered["payload"]["authorization"]["from"] = "0x" + "99" * 20
+        tampered_header = base64.b64encode(json.dumps(tampered).encode()).decode()
+        assert server._verify_payment(tampered_header, service) is None
+    
+    def test_verify_payment_rejects_other_token(self, server):
+        service = self._paid_service(server)
+        header = self._signed_header(server, token="0x" + "77" * 20)
+        
+        assert server._verify_payment(header, service) is None
+    
+    def test_verify_payment_rejects_replay(self, server):
+        service = self._paid_service(server)
+        header = self._signed_header(server)
+        
+        assert server._verify_payment(header, service) is not None
+        assert server._verify_payment(header, service) is None
+    
     def test_revenue_tracking(self, server):
         payment = PaymentRecord(
             service="test",
@@ -216,8 +444,6 @@ class TestX402Server:
         assert len(server.payments) == 1
     
     def test_daily_reset(self, server):
-        from datetime import datetime, timedelta
-        
         server.daily_revenue = Decimal("100")
         server.daily_reset = datetime.now() - timedelta(hours=25)
         